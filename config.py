@@ -6,9 +6,15 @@ Handles configuration settings and validation for the migration tool.
 
 import os
 import logging
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# Supported migration modes
+VALID_MODES = ('option1', 'option2', 'option3', 'option4')
+
 class MigrationConfig:
     """Configuration class for migration settings."""
     
@@ -32,8 +38,6 @@ class MigrationConfig:
             restore_path: Restore file path for option3
             create_backup: Whether to create backup before migration
         """
-        self.logger = logging.getLogger(__name__)
-        
         # Validate migration mode
         self._validate_mode(mode)
         self.mode = mode
@@ -54,18 +58,57 @@ class MigrationConfig:
         
         self.create_backup = create_backup
         
-        # Set up derived paths
-        self.data_path = os.path.join(self.target_path, 'data')
-        self.media_path = os.path.join(self.target_path, 'media')
-        self.report_path = os.path.join(self.target_path, 'migration_reports')
-        
-        self.logger.debug(f"Configuration loaded: mode={mode}, source={source_path}, target={target_path}")
+        logger.debug(f"Configuration loaded: mode={mode}, source={source_path}, target={target_path}")
     
     def _validate_mode(self, mode: str):
         """Validate migration mode."""
-        valid_modes = ['option1', 'option2', 'option3', 'option4']
-        if mode not in valid_modes:
-            raise ValueError(f"Invalid migration mode: {mode}. Valid modes: {valid_modes}")
+        if mode not in VALID_MODES:
+            raise ValueError(f"Invalid migration mode: {mode}. Valid modes: {list(VALID_MODES)}")
+    
+    # Derived paths are computed on first access and cached. Source and target
+    # paths are already normalized and absolute, so derived paths are built by
+    # appending to a separator-terminated prefix rather than os.path.join.
+    
+    @cached_property
+    def _target_prefix(self) -> str:
+        return os.path.join(self.target_path, '')
+    
+    @cached_property
+    def _source_prefix(self) -> Optional[str]:
+        if self.source_path:
+            return os.path.join(self.source_path, '')
+        return None
+    
+    @cached_property
+    def data_path(self) -> str:
+        """Target data directory."""
+        return self._target_prefix + 'data'
+    
+    @cached_property
+    def media_path(self) -> str:
+        """Target media directory."""
+        return self._target_prefix + 'media'
+    
+    @cached_property
+    def report_path(self) -> str:
+        """Target migration reports directory."""
+        return self._target_prefix + 'migration_reports'
+    
+    @cached_property
+    def _source_db_path(self) -> Optional[str]:
+        if self._source_prefix:
+            return self._source_prefix + 'data' + os.sep + 'shots.db'
+        return None
+    
+    @cached_property
+    def _target_db_path(self) -> str:
+        return self.data_path + os.sep + 'shots.db'
+    
+    @cached_property
+    def _source_media_path(self) -> Optional[str]:
+        if self._source_prefix:
+            return self._source_prefix + 'media'
+        return None
     
     def _validate_path(self, path: Optional[str], required: bool = False) -> Optional[str]:
         """
@@ -93,22 +136,27 @@ class MigrationConfig:
         
         return normalized_path
     
-    def validate_source_exists(self):
-        """Validate that source path exists (if applicable)."""
-        if self.source_path and not os.path.exists(self.source_path):
-            raise FileNotFoundError(f"Source path does not exist: {self.source_path}")
-    
-    def validate_target_writable(self):
-        """Validate that target directory is writable."""
+    def validate_target_writable(self, strict: bool = False):
+        """
+        Validate that target directory is writable.
+        
+        Args:
+            strict: Probe by creating and removing a test file instead of
+                relying on os.access (for filesystems where ACLs make the
+                permission bits unreliable)
+        """
         try:
             # Try to create target directory if it doesn't exist
             os.makedirs(self.target_path, exist_ok=True)
             
-            # Test write permissions
-            test_file = os.path.join(self.target_path, '.write_test')
-            with open(test_file, 'w') as f:
-                f.write('test')
-            os.remove(test_file)
+            if strict:
+                # Test write permissions
+                test_file = os.path.join(self.target_path, '.write_test')
+                with open(test_file, 'w') as f:
+                    f.write('test')
+                os.remove(test_file)
+            elif not os.access(self.target_path, os.W_OK):
+                raise PermissionError(f"Target directory is not writable: {self.target_path}")
             
         except Exception as e:
             raise PermissionError(f"Cannot write to target directory: {e}")
@@ -116,60 +164,84 @@ class MigrationConfig:
     def validate_csv_file(self):
         """Validate CSV file for option2."""
         if self.mode == 'option2':
-            if not self.csv_path:
-                raise ValueError("CSV file path is required for option2")
-            
-            if not os.path.exists(self.csv_path):
-                raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+            self._validate_csv_file()
     
     def validate_restore_file(self):
         """Validate restore file for option3."""
         if self.mode == 'option3':
-            if not self.restore_path:
-                raise ValueError("Restore file path is required for option3")
-            
-            if not os.path.exists(self.restore_path):
-                raise FileNotFoundError(f"Restore file not found: {self.restore_path}")
+            self._validate_restore_file()
     
     def validate_source_exists(self):
         """Validate that source path exists (with mode-specific logic)."""
-        if self.mode == 'option4':
-            # For option4, validate aimms_import structure
-            if not self.source_path:
-                raise ValueError("Source path is required for option4")
-            
-            if not os.path.exists(self.source_path):
-                raise FileNotFoundError(f"Source path does not exist: {self.source_path}")
-            
-            # Check for required subdirectories
-            image_storyboard = os.path.join(self.source_path, 'image_storyboard')
-            video_storyboard = os.path.join(self.source_path, 'video_storyboard')
-            
-            if not os.path.exists(image_storyboard):
-                self.logger.warning(f"image_storyboard directory not found: {image_storyboard}")
-            
-            if not os.path.exists(video_storyboard):
-                self.logger.warning(f"video_storyboard directory not found: {video_storyboard}")
-        else:
-            # For other modes, use original logic
-            if self.source_path and not os.path.exists(self.source_path):
-                raise FileNotFoundError(f"Source path does not exist: {self.source_path}")
+        self._SOURCE_VALIDATORS.get(self.mode, MigrationConfig._validate_source_default)(self)
+    
+    def validate(self):
+        """Run every validation that applies to the current mode."""
+        self.validate_source_exists()
+        self.validate_target_writable()
+        for validator in self._MODE_VALIDATORS.get(self.mode, ()):
+            validator(self)
+    
+    def _validate_csv_file(self):
+        """Validate that the CSV file is given and exists."""
+        if not self.csv_path:
+            raise ValueError("CSV file path is required for option2")
+        
+        if not os.path.exists(self.csv_path):
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+    
+    def _validate_restore_file(self):
+        """Validate that the restore file is given and exists."""
+        if not self.restore_path:
+            raise ValueError("Restore file path is required for option3")
+        
+        if not os.path.exists(self.restore_path):
+            raise FileNotFoundError(f"Restore file not found: {self.restore_path}")
+    
+    def _validate_source_default(self):
+        """Validate that source path exists (if applicable)."""
+        if self.source_path and not os.path.exists(self.source_path):
+            raise FileNotFoundError(f"Source path does not exist: {self.source_path}")
+    
+    def _validate_source_option4(self):
+        """Validate the aimms_import source structure for option4."""
+        if not self.source_path:
+            raise ValueError("Source path is required for option4")
+        
+        if not os.path.exists(self.source_path):
+            raise FileNotFoundError(f"Source path does not exist: {self.source_path}")
+        
+        # Check for required subdirectories
+        image_storyboard = os.path.join(self.source_path, 'image_storyboard')
+        video_storyboard = os.path.join(self.source_path, 'video_storyboard')
+        
+        if not os.path.exists(image_storyboard):
+            logger.warning(f"image_storyboard directory not found: {image_storyboard}")
+        
+        if not os.path.exists(video_storyboard):
+            logger.warning(f"video_storyboard directory not found: {video_storyboard}")
+    
+    # Mode-specific validator tables
+    _SOURCE_VALIDATORS = {
+        'option4': _validate_source_option4,
+    }
+    
+    _MODE_VALIDATORS = {
+        'option2': (_validate_csv_file,),
+        'option3': (_validate_restore_file,),
+    }
     
     def get_source_db_path(self) -> Optional[str]:
         """Get path to source database file."""
-        if self.source_path:
-            return os.path.join(self.source_path, 'data', 'shots.db')
-        return None
+        return self._source_db_path
     
     def get_target_db_path(self) -> str:
         """Get path to target database file."""
-        return os.path.join(self.data_path, 'shots.db')
+        return self._target_db_path
     
     def get_source_media_path(self) -> Optional[str]:
         """Get path to source media directory."""
-        if self.source_path:
-            return os.path.join(self.source_path, 'media')
-        return None
+        return self._source_media_path
     
     def get_target_media_path(self) -> str:
         """Get path to target media directory."""
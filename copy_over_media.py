@@ -18,15 +18,31 @@ Arguments:
 import os
 import sys
 import csv
+import re
 import shutil
 import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Dict, Set
+from typing import List, Tuple, Dict, Set, Optional
 
+from utils import fast_copy_file
 
-def parse_arguments():
-    """Parse command line arguments."""
+try:
+    import ahocorasick  # Optional: pyahocorasick, used for shot name matching when installed
+except ImportError:
+    ahocorasick = None
+
+
+# Number of concurrent copy threads
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser (constructed once and reused)."""
     parser = argparse.ArgumentParser(
         description="Copy images or videos to shot_name folders based on CSV",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -42,8 +58,14 @@ Examples:
     parser.add_argument("file_type", choices=["image", "video"], help="Type of files to copy: 'image' for .png, 'video' for .mp4/.mkv")
     parser.add_argument("csv_location", help="Path to CSV file containing shot_name column")
     parser.add_argument("source_folder", help="Source directory to scan for files")
+    parser.add_argument("--verbose", action="store_true", help="Print per-shot and per-file progress")
     
-    return parser.parse_args()
+    return parser
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    return _build_parser().parse_args()
 
 
 def read_shot_names_from_csv(csv_path: str) -> List[str]:
@@ -54,47 +76,47 @@ def read_shot_names_from_csv(csv_path: str) -> List[str]:
         # Try multiple common delimiters
         delimiters_to_try = [',', ';', '\t', '|']
         
-        with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
-            # Try to detect delimiter first
-            sample = csvfile.read(1024)
+        with open(csv_path, 'r', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            # Read the header line and a short sample once
+            header_line = csvfile.readline()
+            sample = header_line + csvfile.read(1024)
             csvfile.seek(0)
             
-            delimiter = None
+            sniffed = None
             try:
                 sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
+                sniffed = sniffer.sniff(sample).delimiter
             except:
                 # If sniffing fails, try common delimiters
                 pass
             
-            # If delimiter detection failed, try common ones
-            if delimiter is None:
-                for test_delimiter in delimiters_to_try:
-                    try:
-                        csvfile.seek(0)
-                        reader = csv.DictReader(csvfile, delimiter=test_delimiter)
-                        if 'shot_name' in reader.fieldnames:
-                            delimiter = test_delimiter
-                            break
-                    except:
-                        continue
+            # Pick the first candidate (sniffed first) whose header split contains shot_name
+            candidates = delimiters_to_try if sniffed is None else [sniffed] + delimiters_to_try
+            delimiter = next(
+                (d for d in candidates if 'shot_name' in next(csv.reader([header_line], delimiter=d), [])),
+                sniffed
+            )
             
             if delimiter is None:
                 print(f"Error: Could not determine CSV delimiter. Tried: {delimiters_to_try}")
                 sys.exit(1)
             
-            csvfile.seek(0)
-            reader = csv.DictReader(csvfile, delimiter=delimiter)
+            reader = csv.reader(csvfile, delimiter=delimiter)
+            fieldnames = next(reader, [])
             
             # Check if shot_name column exists
-            if 'shot_name' not in reader.fieldnames:
-                print(f"Error: 'shot_name' column not found in CSV. Available columns: {reader.fieldnames}")
+            if 'shot_name' not in fieldnames:
+                print(f"Error: 'shot_name' column not found in CSV. Available columns: {fieldnames}")
                 sys.exit(1)
             
+            shot_index = fieldnames.index('shot_name')
+            
             for row in reader:
-                shot_name = row['shot_name'].strip()
-                if shot_name:  # Skip empty shot names
-                    shot_names.append(shot_name)
+                if len(row) > shot_index:
+                    # Interned so repeated names share one object and compare by identity
+                    shot_name = sys.intern(row[shot_index].strip())
+                    if shot_name:  # Skip empty shot names
+                        shot_names.append(shot_name)
     
     except FileNotFoundError:
         print(f"Error: CSV file not found: {csv_path}")
@@ -107,94 +129,266 @@ def read_shot_names_from_csv(csv_path: str) -> List[str]:
     return shot_names
 
 
-def find_files_for_shot(source_folder: Path, shot_name: str, file_type: str) -> List[Tuple[Path, Path]]:
-    """Find all files matching the shot name in the source folder."""
-    found_files = []
+def _build_shot_matcher(shot_names: List[str]):
+    """
+    Build a function returning every shot name contained in a (normcased) filename.
     
-    if file_type == "image":
-        # Look for .png files
-        pattern = f"**/*{shot_name}*.png"
-        for file_path in source_folder.glob(pattern):
-            if file_path.is_file():
-                found_files.append((file_path, file_path.name))
-    
-    elif file_type == "video":
-        # Look for .mp4 and .mkv files
-        video_patterns = [f"**/*{shot_name}*.mp4", f"**/*{shot_name}*.mkv"]
-        
-        for pattern in video_patterns:
-            for video_path in source_folder.glob(pattern):
-                if video_path.is_file():
-                    # Look for matching .png file in the same directory
-                    png_path = video_path.with_suffix('.png')
-                    
-                    if png_path.exists() and png_path.is_file():
-                        # Found matching video and image pair
-                        found_files.append((video_path, video_path.name))
-                        found_files.append((png_path, png_path.name))
-                    else:
-                        print(f"Warning: Found video {video_path} but no matching PNG file")
-                        found_files.append((video_path, video_path.name))
-    
-    return found_files
-
-
-def copy_file_with_rename(source_path: Path, target_dir: Path, original_name: str, copy_count: Dict[str, int]) -> Tuple[Path, str]:
-    """Copy file to target directory, renaming if necessary to avoid overwrites."""
-    target_path = target_dir / original_name
-    
-    # Check if file already exists
-    if target_path.exists():
-        # Increment counter for this filename
-        if original_name not in copy_count:
-            copy_count[original_name] = 1
+    Uses a pyahocorasick automaton when that package is installed. Otherwise
+    all shot names are compiled into one regex scanned at every position of the
+    filename. Alternatives are ordered longest first, so the hit at a position is
+    the longest shot starting there; shorter shots matching at the same position
+    are exactly the prefixes of that hit and are looked up from a table.
+    """
+    shots_by_key = {}
+    for shot_name in dict.fromkeys(shot_names):
+        shots_by_key.setdefault(sys.intern(os.path.normcase(shot_name)), []).append(shot_name)
+    
+    if not shots_by_key:
+        return lambda file_name: []
+    
+    if ahocorasick is not None:
+        # Aho-Corasick automaton: one scan per filename reports every contained key
+        automaton = ahocorasick.Automaton()
+        for key, shots in shots_by_key.items():
+            automaton.add_word(key, shots)
+        automaton.make_automaton()
         
-        copy_count[original_name] += 1
-        name_parts = original_name.rsplit('.', 1)
-        new_name = f"{name_parts[0]}_copy{copy_count[original_name]}.{name_parts[1]}"
-        target_path = target_dir / new_name
+        def match_automaton(file_name: str) -> List[str]:
+            return list(dict.fromkeys(
+                shot_name for _, shots in automaton.iter(file_name) for shot_name in shots
+            ))
         
-        return source_path, new_name
+        return match_automaton
+    
+    keys = sorted(shots_by_key, key=len, reverse=True)
+    shot_re = re.compile('(?=(' + '|'.join(map(re.escape, keys)) + '))')
     
-    return source_path, original_name
+    # For each key, the shots whose key is a prefix of it (itself included)
+    prefix_shots = {
+        key: [shot_name for other in keys if key.startswith(other) for shot_name in shots_by_key[other]]
+        for key in keys
+    }
+    
+    def match(file_name: str) -> List[str]:
+        hits = set(shot_re.findall(file_name))
+        if len(hits) == 1:
+            return prefix_shots[hits.pop()]
+        return list(dict.fromkeys(
+            shot_name for hit in hits for shot_name in prefix_shots[hit]
+        ))
+    
+    return match
 
 
-def create_report(report_path: Path, copy_log: List[Dict], errors: List[str]):
-    """Create a detailed report of the copying process."""
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("COPY OVER FILES REPORT\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"File Type: {copy_log[0]['file_type'] if copy_log else 'N/A'}\n")
-        f.write("\n")
+def _index_source(source_folder: Path, file_type: str, shot_names: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Walk the source folder once and map each shot name to its matching files.
+    
+    A file belongs to every shot whose name appears in its filename. For videos,
+    a .png with the same stem in the same directory is paired with the video.
+    Name comparisons follow the platform's filename case rules.
+    
+    Paths are kept as plain strings; pathlib objects are only used at the
+    command line boundary.
+    
+    Returns:
+        Dictionary of shot_name -> list of (file_path, file_name) tuples
+    """
+    if file_type == "image":
+        extensions = ('.png',)
+    else:
+        extensions = ('.mp4', '.mkv')
+    
+    match_shots = _build_shot_matcher(shot_names)
+    index = {}
+    
+    # Iterative scandir walk; DirEntry type checks reuse the readdir data, so
+    # no extra stat is needed per candidate on most filesystems
+    pending_dirs = [os.fspath(source_folder)]
+    
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
         
-        if errors:
-            f.write("ERRORS:\n")
-            f.write("-" * 40 + "\n")
-            for error in errors:
-                f.write(f"• {error}\n")
-            f.write("\n")
+        files = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                pending_dirs.append(entry.path)
+            elif entry.is_file():
+                files.append(entry)
         
-        f.write("COPY LOG:\n")
-        f.write("-" * 40 + "\n")
+        names_in_dir = None
         
-        for entry in copy_log:
-            f.write(f"\nShot Name: {entry['shot_name']}\n")
-            f.write(f"Files Found: {len(entry['files'])}\n")
+        for entry in files:
+            normalized_name = os.path.normcase(entry.name)
+            if not normalized_name.endswith(extensions):
+                continue
+            
+            # Shot names are matched against the stem only, as the old
+            # '*{shot}*.png' glob did; the extension never counts
+            normalized_stem = os.path.splitext(normalized_name)[0]
+            matching_shots = match_shots(normalized_stem)
+            if not matching_shots:
+                continue
+            
+            file_path = entry.path
+            found_files = [(file_path, entry.name)]
+            
+            if file_type == "video":
+                # Look for matching .png file in the same directory
+                if names_in_dir is None:
+                    names_in_dir = {os.path.normcase(f.name): f for f in files}
+                png_entry = names_in_dir.get(normalized_stem + '.png')
+                
+                if png_entry is not None:
+                    # Found matching video and image pair
+                    found_files.append((png_entry.path, png_entry.name))
+                else:
+                    print(f"Warning: Found video {file_path} but no matching PNG file")
             
-            for file_info in entry['files']:
-                f.write(f"  • {file_info['original_path']} -> {file_info['target_path']}\n")
-                if file_info['renamed']:
-                    f.write(f"    (Renamed from: {file_info['original_name']})\n")
+            for shot_name in matching_shots:
+                index.setdefault(shot_name, []).extend(found_files)
+    
+    return index
+
+
+def copy_file_with_rename(source_path: str, target_dir: str, original_name: str, copy_count: Dict[str, int],
+                          written: Optional[Set[str]] = None) -> Tuple[str, str]:
+    """Copy file to target directory, renaming if necessary to avoid overwrites.
+    
+    ``written`` holds the normcased names already present in the target
+    directory, including copies queued but not yet performed. When given it
+    replaces the per-file existence check, and the chosen name is added to it.
+    """
+    def is_taken(name: str) -> bool:
+        if written is not None:
+            return os.path.normcase(name) in written
+        return os.path.exists(os.path.join(target_dir, name))
+    
+    target_name = original_name
+    
+    # Check if file already exists (on disk or queued for this batch)
+    if is_taken(original_name):
+        stem, extension = os.path.splitext(original_name)
+        while True:
+            # Increment counter for this filename (copy_count starts each name at 1)
+            copy_count[original_name] += 1
+            target_name = f"{stem}_copy{copy_count[original_name]}{extension}"
+            if not is_taken(target_name):
+                break
+    
+    if written is not None:
+        written.add(os.path.normcase(target_name))
+    
+    return source_path, target_name
+
+
+def _copy_one(source_path: str, target_path: str) -> Optional[Exception]:
+    """Copy a single file's contents, returning the raised exception instead of propagating it."""
+    try:
+        fast_copy_file(source_path, target_path)
+    except Exception as e:
+        return e
+    return None
+
+
+def _copy_batch(pairs: List[Tuple[str, str]]) -> List[Optional[Exception]]:
+    """
+    Copy a batch of (source, target) pairs.
+    
+    File contents are copied concurrently on a thread pool (the copies spend
+    their time in I/O with the GIL released), then metadata is re-applied in a
+    single post-pass. Target names must already be unique within the batch.
+    
+    Returns:
+        List parallel to ``pairs`` holding None on success or the raised exception
+    """
+    if not pairs:
+        return []
+    
+    max_workers = min(COPY_WORKERS, len(pairs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda pair: _copy_one(*pair), pairs))
+    
+    # Metadata post-pass (timestamps and permission bits, as copy2 would)
+    for (source_path, target_path), error in zip(pairs, results):
+        if error is not None:
+            continue
+        try:
+            shutil.copystat(source_path, target_path)
+        except OSError:
+            pass
+    
+    return results
+
+
+class _ConsoleBuffer:
+    """Collects console lines and writes them to stdout in batches."""
+    
+    def __init__(self, flush_every: int = 1000):
+        self.lines = []
+        self.flush_every = flush_every
+    
+    def add(self, line: str):
+        self.lines.append(line)
+        if len(self.lines) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        if self.lines:
+            sys.stdout.write('\n'.join(self.lines) + '\n')
+            sys.stdout.flush()
+            self.lines.clear()
+
+
+def create_report(report_path: Path, copy_log: List[Dict], errors: List[str]):
+    """Create a detailed report of the copying process."""
+    parts = [
+        "=" * 80 + "\n",
+        "COPY OVER FILES REPORT\n",
+        "=" * 80 + "\n",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+        f"File Type: {copy_log[0]['file_type'] if copy_log else 'N/A'}\n",
+        "\n",
+    ]
+    
+    if errors:
+        parts.append("ERRORS:\n")
+        parts.append("-" * 40 + "\n")
+        parts.extend(f"• {error}\n" for error in errors)
+        parts.append("\n")
+    
+    parts.append("COPY LOG:\n")
+    parts.append("-" * 40 + "\n")
+    
+    for entry in copy_log:
+        parts.append(f"\nShot Name: {entry['shot_name']}\nFiles Found: {len(entry['files'])}\n")
         
-        f.write("\n" + "=" * 80 + "\n")
-        f.write("SUMMARY:\n")
-        f.write(f"Total shots processed: {len(copy_log)}\n")
-        total_files = sum(len(entry['files']) for entry in copy_log)
-        f.write(f"Total files copied: {total_files}\n")
-        f.write(f"Errors encountered: {len(errors)}\n")
-        f.write("=" * 80 + "\n")
+        for file_info in entry['files']:
+            if file_info['renamed']:
+                parts.append(
+                    f"  • {file_info['original_path']} -> {file_info['target_path']}\n"
+                    f"    (Renamed from: {file_info['original_name']})\n"
+                )
+            else:
+                parts.append(f"  • {file_info['original_path']} -> {file_info['target_path']}\n")
+    
+    total_files = sum(len(entry['files']) for entry in copy_log)
+    parts.extend([
+        "\n" + "=" * 80 + "\n",
+        "SUMMARY:\n",
+        f"Total shots processed: {len(copy_log)}\n",
+        f"Total files copied: {total_files}\n",
+        f"Errors encountered: {len(errors)}\n",
+        "=" * 80 + "\n",
+    ])
+    
+    # Write the whole report in one call
+    with open(report_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(''.join(parts))
 
 
 def main():
@@ -239,69 +433,114 @@ def main():
     print(f"Report will be saved to: {report_path}")
     print("-" * 80)
     
-    # Process each shot name
+    # Scan the source tree once for all shots
+    print("Scanning source folder...")
+    out = _ConsoleBuffer()
+    verbose = args.verbose
+    source_index = _index_source(source_folder, args.file_type, shot_names)
+    
+    # Process each shot name, collecting the copies to perform in one batch
+    pending_copies = []
+    planned = []
+    # Only directories count; a file with a shot's name must still fail makedirs
+    with os.scandir(location_to_save) as entries:
+        existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+    written_by_dir = {}
+    target_prefix = os.path.join(os.fspath(location_to_save), '')
+    
     for i, shot_name in enumerate(shot_names, 1):
-        print(f"\n[{i}/{len(shot_names)}] Processing shot: {shot_name}")
+        if verbose:
+            out.add(f"\n[{i}/{len(shot_names)}] Processing shot: {shot_name}")
         
         # Create target directory for this shot
-        shot_target_dir = location_to_save / shot_name
-        shot_target_dir.mkdir(exist_ok=True)
+        shot_target_dir = target_prefix + shot_name
+        if shot_name not in existing_dirs:
+            try:
+                os.makedirs(shot_target_dir)
+            except FileExistsError:
+                # Already there under another case or path form; its files are
+                # listed below like any existing folder
+                if not os.path.isdir(shot_target_dir):
+                    raise
+            else:
+                # Only a folder created just now is known to be empty
+                written_by_dir[shot_name] = set()
+            existing_dirs.add(shot_name)
+        shot_target_prefix = shot_target_dir + os.sep
         
         # Find files for this shot
-        found_files = find_files_for_shot(source_folder, shot_name, args.file_type)
+        found_files = source_index.get(shot_name, [])
         
         if not found_files:
-            print(f"  No files found for {shot_name}")
+            if verbose:
+                out.add(f"  No files found for {shot_name}")
             continue
         
-        print(f"  Found {len(found_files)} file(s)")
+        if verbose:
+            out.add(f"  Found {len(found_files)} file(s)")
+        
+        # Names already in the shot folder, listed once (plus names queued in this run)
+        written = written_by_dir.get(shot_name)
+        if written is None:
+            written = {os.path.normcase(name) for name in os.listdir(shot_target_dir)}
+            written_by_dir[shot_name] = written
         
-        # Copy files with rename handling
-        shot_files = []
-        copy_count = {}
+        # Resolve target names up front
+        copy_count = defaultdict(lambda: 1)
         
         for source_path, original_name in found_files:
-            try:
-                # Copy file with potential rename
-                source_file, target_name = copy_file_with_rename(
-                    source_path, shot_target_dir, original_name, copy_count
-                )
-                
-                # Perform actual copy
-                target_path = shot_target_dir / target_name
-                shutil.copy2(source_path, target_path)
-                
-                # Log the copy
-                is_renamed = target_name != original_name
-                if is_renamed:
-                    total_renamed += 1
-                
-                shot_files.append({
-                    'original_path': str(source_path),
-                    'original_name': original_name,
-                    'target_path': str(target_path),
-                    'renamed': is_renamed
-                })
-                
-                total_copied += 1
-                
-                if is_renamed:
-                    print(f"    ✓ Copied (renamed): {original_name} -> {target_name}")
-                else:
-                    print(f"    ✓ Copied: {target_name}")
-                
-            except Exception as e:
-                error_msg = f"Failed to copy {source_path}: {str(e)}"
-                print(f"    ✗ {error_msg}")
-                errors.append(error_msg)
+            source_file, target_name = copy_file_with_rename(
+                source_path, shot_target_dir, original_name, copy_count, written
+            )
+            
+            target_path = shot_target_prefix + target_name
+            pending_copies.append((source_path, target_path))
+            planned.append((shot_name, original_name, target_name))
+    
+    # Perform the queued copies in a single batch
+    out.flush()
+    print(f"\nCopying {len(pending_copies)} file(s)...")
+    copy_results = _copy_batch(pending_copies)
+    
+    shot_files_by_name = {}
+    for (source_path, target_path), (shot_name, original_name, target_name), error in zip(
+        pending_copies, planned, copy_results
+    ):
+        if error is not None:
+            error_msg = f"Failed to copy {source_path}: {str(error)}"
+            out.add(f"    ✗ {error_msg}")
+            errors.append(error_msg)
+            continue
         
-        # Add to copy log
-        if shot_files:
-            copy_log.append({
-                'shot_name': shot_name,
-                'file_type': args.file_type,
-                'files': shot_files
-            })
+        # Log the copy
+        is_renamed = target_name != original_name
+        if is_renamed:
+            total_renamed += 1
+        
+        shot_files_by_name.setdefault(shot_name, []).append({
+            'original_path': source_path,
+            'original_name': original_name,
+            'target_path': target_path,
+            'renamed': is_renamed
+        })
+        
+        total_copied += 1
+        
+        if verbose:
+            if is_renamed:
+                out.add(f"    ✓ Copied (renamed): {original_name} -> {target_name}")
+            else:
+                out.add(f"    ✓ Copied: {target_name}")
+    
+    out.flush()
+    
+    # Add to copy log, preserving CSV order
+    for shot_name, shot_files in shot_files_by_name.items():
+        copy_log.append({
+            'shot_name': shot_name,
+            'file_type': args.file_type,
+            'files': shot_files
+        })
     
     # Create report
     create_report(report_path, copy_log, errors)
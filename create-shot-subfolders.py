@@ -16,6 +16,7 @@ import argparse
 import csv
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -53,30 +54,51 @@ def create_shot_folders(csv_file_path, target_folder):
     
     # Read CSV and create folders
     try:
-        with open(csv_path, mode='r', newline='', encoding='utf-8') as csvfile:
-            # Try to detect the delimiter
-            sample = csvfile.read(1024)
+        with open(csv_path, mode='r', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            # Read the header line and a short sample once
+            header_line = csvfile.readline()
+            sample = header_line + csvfile.read(1024)
             csvfile.seek(0)
             
             # Common delimiters to try
+            delimiters_to_try = [',', ';', '\t', '|']
             sniffer = csv.Sniffer()
             try:
-                delimiter = sniffer.sniff(sample).delimiter
+                sniffed = sniffer.sniff(sample).delimiter
+                candidates = [sniffed] + delimiters_to_try
             except:
-                delimiter = ','  # Default to comma if detection fails
+                sniffed = ','  # Default to comma if detection fails
+                candidates = delimiters_to_try
             
-            reader = csv.DictReader(csvfile, delimiter=delimiter)
+            # Pick the first candidate whose header split contains shot_name
+            delimiter = next(
+                (d for d in candidates if 'shot_name' in next(csv.reader([header_line], delimiter=d), [])),
+                sniffed
+            )
+            
+            reader = csv.reader(csvfile, delimiter=delimiter)
+            fieldnames = next(reader, [])
             
             # Check if 'shot_name' column exists
-            if 'shot_name' not in reader.fieldnames:
-                print(f"Error: 'shot_name' column not found in CSV. Available columns: {reader.fieldnames}")
-                return 0, 1, [f"'shot_name' column not found. Available: {reader.fieldnames}"]
+            if 'shot_name' not in fieldnames:
+                print(f"Error: 'shot_name' column not found in CSV. Available columns: {fieldnames}")
+                return 0, 1, [f"'shot_name' column not found. Available: {fieldnames}"]
+            
+            shot_index = fieldnames.index('shot_name')
             
-            print(f"CSV columns found: {reader.fieldnames}")
+            print(f"CSV columns found: {fieldnames}")
             print(f"Processing shots...")
             
+            # List existing folders once rather than probing each shot (only
+            # directories count; a file with a shot's name must still fail mkdir)
+            with os.scandir(target_path) as entries:
+                existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+            
             for row_num, row in enumerate(reader, start=2):  # Start at 2 because header is row 1
-                shot_name = row.get('shot_name', '').strip()
+                if not row:
+                    continue  # Skip blank lines
+                
+                shot_name = sys.intern(row[shot_index].strip()) if len(row) > shot_index else ''
                 
                 if not shot_name:
                     print(f"Warning: Empty shot_name in row {row_num}")
@@ -87,7 +109,9 @@ def create_shot_folders(csv_file_path, target_folder):
                 
                 try:
                     # Create the folder
-                    folder_path.mkdir(exist_ok=True)
+                    if shot_name not in existing_dirs:
+                        folder_path.mkdir(exist_ok=True)
+                        existing_dirs.add(shot_name)
                     print(f"✓ Created folder: {shot_name}")
                     success_count += 1
                 except Exception as e:
@@ -105,8 +129,9 @@ def create_shot_folders(csv_file_path, target_folder):
     return success_count, error_count, errors
 
 
-def main():
-    """Main function to parse arguments and execute the script."""
+@lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command line parser (constructed once and reused)."""
     parser = argparse.ArgumentParser(
         description="Create subfolders for each shot name from a CSV file.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -127,7 +152,12 @@ Examples:
         help='Path to the target folder where subfolders will be created'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main function to parse arguments and execute the script."""
+    args = _build_parser().parse_args()
     
     print("=" * 60)
     print("Create Shot Subfolders")
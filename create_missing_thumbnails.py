@@ -6,44 +6,222 @@ A script to scan through a target folder and its subfolders,
 checking for mp4 or mkv files and generating missing png thumbnails.
 
 Usage:
-    python create_missing_thumbnails.py [target_folder]
+    python create_missing_thumbnails.py [target_folder] [--jobs N] [--index PATH | --no-index]
+                                        [--newest-first]
 
 If no target folder is provided, it will prompt for one.
 """
 
 import os
 import sys
-import subprocess
+import asyncio
 import datetime
 import argparse
+import json
+import shutil
 from pathlib import Path
-from typing import List, Tuple, Set
+from typing import Dict, List, Optional, Tuple
 
+try:
+    from tqdm import tqdm
+except ImportError:  # Optional: fall back to one line per thumbnail
+    tqdm = None
 
-def get_video_files(directory: Path) -> List[Path]:
-    """Get all mp4 and mkv files in the directory and subdirectories."""
+
+# Sidecar scan index (folder state from the previous run)
+DEFAULT_INDEX_NAME = '.thumbnail_index.json'
+INDEX_VERSION = 1
+
+# Video file extensions to generate thumbnails for
+VIDEO_EXTENSIONS = ('.mp4', '.mkv')
+
+# Container signatures checked before spawning ffmpeg: ISO/QuickTime box types
+# at offset 4 (mp4) and the EBML magic at offset 0 (mkv)
+MP4_BOX_TYPES = {b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip', b'pnot'}
+EBML_MAGIC = b'\x1a\x45\xdf\xa3'
+
+# Maximum number of videos handled by a single ffmpeg process
+MAX_BATCH_SIZE = 16
+
+# Stream buffer limit for reading ffmpeg's piped output
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+
+def load_thumbnail_index(index_path: Path) -> Dict[str, Dict]:
+    """Load the sidecar scan index, returning an empty index if it is missing or unreadable."""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index.get('directories', {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def save_thumbnail_index(index_path: Path, directories: Dict[str, Dict]):
+    """Write the sidecar scan index atomically (temp file + os.replace)."""
+    temp_path = f"{index_path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'directories': directories}, f)
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        print(f"Warning: Could not save thumbnail index {index_path}: {e}")
+
+
+def scan_for_missing_thumbnails(
+    directory: Path,
+    index: Optional[Dict[str, Dict]] = None,
+    newest_first: bool = False
+) -> Tuple[List[Path], List[Tuple[Path, Path]], Dict[str, Dict]]:
+    """
+    Walk the tree once, finding all mp4/mkv files and those without a sibling png.
+    
+    Each directory is listed once with os.scandir and the png check is made
+    against that listing. ``index`` maps directory paths (relative to
+    ``directory``) to the state recorded on a previous run for directories
+    whose videos all had thumbnails; when a directory's mtime is unchanged
+    (no entries added, removed or renamed) its recorded videos and
+    subdirectories are reused without listing it again.
+    
+    With ``newest_first`` the missing pairs are ordered by video modification
+    time, newest first, using the stat data of the directory entries (free on
+    Windows; one stat per missing video elsewhere). Otherwise they follow the
+    walk order.
+    
+    Returns:
+        Tuple of (video_files, missing (video, png) pairs, updated index)
+    """
+    index = index or {}
+    new_index = {}
     video_files = []
-    for ext in ['*.mp4', '*.mkv']:
-        video_files.extend(directory.rglob(ext))
-    return sorted(video_files)
+    missing_thumbnails = []
+    missing_mtimes = []
+    
+    root = os.fspath(directory)
+    root_prefix_len = len(os.path.join(root, ''))
+    pending_dirs = [root]
+    
+    while pending_dirs:
+        dir_path = pending_dirs.pop()
+        relative_dir = dir_path[root_prefix_len:]
+        
+        try:
+            dir_mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            continue
+        
+        cached = index.get(relative_dir)
+        if cached is not None and cached.get('mtime_ns') == dir_mtime:
+            # Unchanged since the last scan and every video had a thumbnail
+            video_files.extend(Path(dir_path, name) for name in cached['videos'])
+            pending_dirs.extend(os.path.join(dir_path, name) for name in reversed(cached['subdirs']))
+            new_index[relative_dir] = cached
+            continue
+        
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        
+        subdirs = []
+        videos = []
+        file_names = set()
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.is_file():
+                file_names.add(os.path.normcase(entry.name))
+                if entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(entry)
+        
+        all_present = True
+        for entry in videos:
+            video_file = Path(entry.path)
+            video_files.append(video_file)
+            png_name = os.path.splitext(entry.name)[0] + '.png'
+            if os.path.normcase(png_name) not in file_names:
+                missing_thumbnails.append((video_file, Path(dir_path, png_name)))
+                if newest_first:
+                    missing_mtimes.append(entry.stat().st_mtime_ns)
+                all_present = False
+        videos = [entry.name for entry in videos]
+        
+        if all_present:
+            new_index[relative_dir] = {'mtime_ns': dir_mtime, 'videos': videos, 'subdirs': subdirs}
+        
+        # Reversed so the stack pops subdirectories in name order
+        pending_dirs.extend(os.path.join(dir_path, name) for name in reversed(subdirs))
+    
+    if newest_first:
+        order = sorted(range(len(missing_thumbnails)), key=lambda i: missing_mtimes[i], reverse=True)
+        missing_thumbnails = [missing_thumbnails[i] for i in order]
+    
+    return video_files, missing_thumbnails, new_index
 
 
-def get_png_files(directory: Path) -> Set[Path]:
-    """Get all png files in the directory and subdirectories."""
-    png_files = set()
-    for png_file in directory.rglob('*.png'):
-        png_files.add(png_file)
-    return png_files
+def _is_valid_video(video_path: Path) -> bool:
+    """
+    Check the file header for an mp4 or mkv container signature.
+    
+    Reads only the first 16 bytes, so empty, truncated or mislabelled files
+    (e.g. saved error pages) can be rejected without starting ffmpeg.
+    """
+    try:
+        with open(video_path, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return False
+    
+    return header[4:8] in MP4_BOX_TYPES or header.startswith(EBML_MAGIC)
 
 
-def generate_thumbnail(video_path: Path, output_path: Path, duration: int = 5) -> bool:
+def _log(message: str) -> None:
+    """Print a message without breaking an active progress bar."""
+    if tqdm is not None:
+        tqdm.write(message)
+    else:
+        print(message)
+
+
+def _output_is_valid(output_path: Path) -> bool:
+    """Check that a generated thumbnail exists and has content."""
+    return output_path.exists() and output_path.stat().st_size > 0
+
+
+async def _run_ffmpeg(cmd: List[str], capture_stdout: bool = False) -> Tuple[int, bytes, str]:
+    """
+    Run an ffmpeg command without blocking the event loop.
+    
+    Returns:
+        Tuple of (exit code, stdout bytes, stderr text); stdout is empty
+        unless ``capture_stdout`` is set
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        limit=PIPE_BUFFER_SIZE
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout or b'', stderr.decode(errors='replace')
+
+
+async def generate_thumbnail_async(video_path: Path, output_path: Path, duration: int = 5,
+                                   ffmpeg_path: str = 'ffmpeg') -> bool:
     """
     Generate a thumbnail from a video file using ffmpeg.
     
+    ffmpeg streams the png to stdout and it is written with a single call,
+    so nothing is written to disk when ffmpeg produces no image.
+    
     Args:
         video_path: Path to the video file
         output_path: Path where the thumbnail should be saved
         duration: Time in seconds from the start to capture the thumbnail
+        ffmpeg_path: ffmpeg executable (resolved once by the caller)
         
     Returns:
         bool: True if successful, False otherwise
@@ -54,49 +232,159 @@ def generate_thumbnail(video_path: Path, output_path: Path, duration: int = 5) -
         # -vframes 1 captures only one frame
         # -vf "scale=320:-1" scales the image to width 320 while maintaining aspect ratio
         cmd = [
-            'ffmpeg',
+            ffmpeg_path,
             '-y',  # Overwrite output file if it exists
             '-i', str(video_path),
             '-ss', str(duration),
             '-vframes', '1',
             '-vf', 'scale=320:-1',
-            str(output_path)
+            '-threads', '1',  # One thread per ffmpeg; parallelism comes from running several
+            '-f', 'image2pipe',
+            '-c:v', 'png',
+            'pipe:1'
         ]
         
         # Run the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Check if the output file was created and has content
-        if output_path.exists() and output_path.stat().st_size > 0:
-            return True
-        else:
+        returncode, png_data, stderr = await _run_ffmpeg(cmd, capture_stdout=True)
+        
+        if returncode != 0:
+            _log(f"Error generating thumbnail for {video_path}: ffmpeg exited with status {returncode}")
+            _log(f"FFmpeg stderr: {stderr}")
+            return False
+        
+        if not png_data:
+            _log(f"Error generating thumbnail for {video_path}: ffmpeg produced no image")
             return False
+        
+        output_path.write_bytes(png_data)
+        return True
             
-    except subprocess.CalledProcessError as e:
-        print(f"Error generating thumbnail for {video_path}: {e}")
-        print(f"FFmpeg stderr: {e.stderr}")
-        return False
     except Exception as e:
-        print(f"Unexpected error generating thumbnail for {video_path}: {e}")
+        _log(f"Unexpected error generating thumbnail for {video_path}: {e}")
         return False
 
 
-def main(target_folder: str = None):
+async def generate_thumbnails_batch_async(pairs: List[Tuple[Path, Path]], duration: int = 5,
+                                          ffmpeg_path: str = 'ffmpeg') -> List[bool]:
+    """
+    Generate thumbnails for several videos with a single ffmpeg process.
+    
+    Each video becomes its own input (seeked to ``duration``) mapped to its
+    own png output, so only one process is spawned per batch. If the batch
+    fails (one bad input fails the whole command), every video is retried
+    individually so good files still get thumbnails. A zero exit status does
+    not mean every output was written (an input with no frame at the seek
+    point is skipped silently), so each png is checked and the missing ones
+    are retried individually too.
+    
+    Args:
+        pairs: List of (video_path, output_path) tuples
+        duration: Time in seconds from the start to capture the thumbnail
+        ffmpeg_path: ffmpeg executable (resolved once by the caller)
+        
+    Returns:
+        List of success flags, parallel to ``pairs``
+    """
+    if len(pairs) == 1:
+        return [await generate_thumbnail_async(pairs[0][0], pairs[0][1], duration, ffmpeg_path)]
+    
+    cmd = [ffmpeg_path, '-y']
+    for video_path, _ in pairs:
+        cmd += ['-ss', str(duration), '-i', str(video_path)]
+    for index, (_, output_path) in enumerate(pairs):
+        cmd += [
+            '-map', f'{index}:v:0',
+            '-vframes', '1',
+            '-vf', 'scale=320:-1',
+            '-threads', '1',
+            str(output_path)
+        ]
+    
+    try:
+        returncode, _, _ = await _run_ffmpeg(cmd)
+    except Exception:
+        returncode = None
+    
+    if returncode != 0:
+        # Fall back to one process per video to isolate the failing input(s)
+        return [
+            await generate_thumbnail_async(video_path, output_path, duration, ffmpeg_path)
+            for video_path, output_path in pairs
+        ]
+    
+    return [
+        _output_is_valid(output_path)
+        or await generate_thumbnail_async(video_path, output_path, duration, ffmpeg_path)
+        for video_path, output_path in pairs
+    ]
+
+
+async def _generate_all(batches: List[List[Tuple[Path, Path]]], jobs: int,
+                        ffmpeg_path: str = 'ffmpeg') -> List[List[bool]]:
+    """Run the thumbnail batches with at most ``jobs`` ffmpeg processes at a time."""
+    semaphore = asyncio.Semaphore(jobs)
+    progress = None
+    if tqdm is not None:
+        progress = tqdm(total=sum(len(batch) for batch in batches), unit='thumb')
+    
+    async def run_batch(batch):
+        async with semaphore:
+            successes = await generate_thumbnails_batch_async(
+                batch, ffmpeg_path=ffmpeg_path
+            )
+        if progress is not None:
+            # Only failures get their own line; successes just advance the bar
+            for (_, png_path), success in zip(batch, successes):
+                if not success:
+                    progress.write(f"  ✗ {png_path.name}")
+            progress.update(len(batch))
+        else:
+            for (_, png_path), success in zip(batch, successes):
+                print(f"  {'✓' if success else '✗'} {png_path.name}")
+        return successes
+    
+    try:
+        return await asyncio.gather(*(run_batch(batch) for batch in batches))
+    finally:
+        if progress is not None:
+            progress.close()
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate missing png thumbnails for mp4/mkv files in a folder tree"
+    )
+    parser.add_argument("target_folder", nargs="?", help="Folder to scan (prompted for if omitted)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of thumbnails to generate in parallel (default: CPU count)")
+    parser.add_argument("--index", default=None,
+                        help=f"Scan index file used to skip unchanged folders (default: <target_folder>/{DEFAULT_INDEX_NAME})")
+    parser.add_argument("--no-index", action="store_true", help="Do not read or write the scan index")
+    parser.add_argument("--newest-first", action="store_true",
+                        help="Generate thumbnails for the most recently modified videos first")
+    return parser.parse_args()
+
+
+def main(target_folder: str = None, jobs: int = None, index_path: str = None,
+         use_index: bool = True, newest_first: bool = False):
     """Main function to scan and generate missing thumbnails."""
     
     # Get target folder
     if not target_folder:
-        if len(sys.argv) > 1:
-            target_folder = sys.argv[1]
-        else:
+        args = parse_arguments()
+        target_folder = args.target_folder
+        if jobs is None:
+            jobs = args.jobs
+        index_path = index_path or args.index
+        use_index = use_index and not args.no_index
+        newest_first = newest_first or args.newest_first
+        if not target_folder:
             target_folder = input("Enter the target folder path: ").strip()
     
-    target_path = Path(target_folder)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    
+    target_path = Path(os.path.abspath(target_folder))
     
     if not target_path.exists():
         print(f"Error: Target folder '{target_folder}' does not exist.")
@@ -109,90 +397,122 @@ def main(target_folder: str = None):
     print(f"Scanning folder: {target_path}")
     print("=" * 60)
     
-    # Get all video and png files
-    video_files = get_video_files(target_path)
-    png_files = get_png_files(target_path)
+    # Find all video files and the ones missing a thumbnail in a single walk
+    index_file = Path(index_path) if index_path else target_path / DEFAULT_INDEX_NAME
+    scan_index = load_thumbnail_index(index_file) if use_index else {}
+    video_files, missing_thumbnails, scan_index = scan_for_missing_thumbnails(
+        target_path, scan_index, newest_first
+    )
     
     print(f"Found {len(video_files)} video files")
-    print(f"Found {len(png_files)} png files")
     print()
     
     # Track results
-    missing_thumbnails = []
     generated_thumbnails = []
     failed_thumbnails = []
     
-    # Check each video file for a matching png
-    for video_file in video_files:
-        # Get the base name without extension
-        base_name = video_file.stem
-        expected_png_path = video_file.parent / f"{base_name}.png"
-        
-        # Check if the png exists
-        if expected_png_path not in png_files:
-            missing_thumbnails.append((video_file, expected_png_path))
+    existing_thumbnails = len(video_files) - len(missing_thumbnails)
     
+    print(f"Found {existing_thumbnails} existing thumbnails")
     print(f"Found {len(missing_thumbnails)} missing thumbnails")
     print()
     
-    # Generate thumbnails for missing ones
+    # Generate thumbnails for missing ones, several ffmpeg processes at a time
     if missing_thumbnails:
-        print("Generating missing thumbnails...")
+        results = {}
+        
+        # Reject videos without a valid container header before spawning ffmpeg
+        to_generate = []
         for video_file, png_path in missing_thumbnails:
-            print(f"  Generating: {png_path.name}")
-            success = generate_thumbnail(video_file, png_path)
+            if _is_valid_video(video_file):
+                to_generate.append((video_file, png_path))
+            else:
+                results[(video_file, png_path)] = False
+                print(f"  ✗ {png_path.name} (invalid header: {video_file.name})")
+        
+        if to_generate:
+            # Resolve ffmpeg once rather than leaving a PATH lookup to every spawn
+            ffmpeg_path = shutil.which('ffmpeg')
+            if ffmpeg_path is None:
+                print("Error: ffmpeg was not found on PATH. Install ffmpeg to generate thumbnails.")
+                sys.exit(2)
+            
+            print(f"Generating missing thumbnails ({jobs} parallel jobs)...")
+            # Split the work into batches so each job spawns one ffmpeg per batch,
+            # keeping batches small enough that every job gets some
+            batch_size = max(1, min(MAX_BATCH_SIZE, -(-len(to_generate) // jobs)))
+            batches = [
+                to_generate[i:i + batch_size]
+                for i in range(0, len(to_generate), batch_size)
+            ]
             
-            if success:
-                generated_thumbnails.append((video_file, png_path))
-                print(f"    ✓ Success")
+            for batch, successes in zip(batches, asyncio.run(
+                _generate_all(batches, jobs, ffmpeg_path)
+            )):
+                for pair, success in zip(batch, successes):
+                    results[pair] = success
+        
+        # Keep report order stable regardless of completion order
+        for pair in missing_thumbnails:
+            if results[pair]:
+                generated_thumbnails.append(pair)
             else:
-                failed_thumbnails.append((video_file, png_path))
-                print(f"    ✗ Failed")
+                failed_thumbnails.append(pair)
         print()
     else:
         print("No missing thumbnails found!")
         print()
     
+    if use_index:
+        save_thumbnail_index(index_file, scan_index)
+    
     # Generate report
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = target_path / f"thumbnail_generation_report_{timestamp}.txt"
     
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write("Thumbnail Generation Report\n")
-        f.write("=" * 60 + "\n")
-        f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Target Folder: {target_path}\n")
-        f.write("\n")
-        
-        f.write(f"Summary:\n")
-        f.write(f"  Video files found: {len(video_files)}\n")
-        f.write(f"  PNG files found: {len(png_files)}\n")
-        f.write(f"  Missing thumbnails: {len(missing_thumbnails)}\n")
-        f.write(f"  Successfully generated: {len(generated_thumbnails)}\n")
-        f.write(f"  Failed to generate: {len(failed_thumbnails)}\n")
-        f.write("\n")
-        
-        if generated_thumbnails:
-            f.write("Successfully generated thumbnails:\n")
-            for video_file, png_path in generated_thumbnails:
-                f.write(f"  {video_file.relative_to(target_path)} -> {png_path.relative_to(target_path)}\n")
-            f.write("\n")
-        
-        if failed_thumbnails:
-            f.write("Failed to generate thumbnails:\n")
-            for video_file, png_path in failed_thumbnails:
-                f.write(f"  {video_file.relative_to(target_path)} -> {png_path.relative_to(target_path)}\n")
-            f.write("\n")
-        
-        if missing_thumbnails and not generated_thumbnails:
-            f.write("No thumbnails were generated (no missing pairs found).\n")
-            f.write("\n")
+    parts = [
+        "Thumbnail Generation Report\n",
+        "=" * 60 + "\n",
+        f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+        f"Target Folder: {target_path}\n",
+        "\n",
+        "Summary:\n",
+        f"  Video files found: {len(video_files)}\n",
+        f"  Existing thumbnails: {existing_thumbnails}\n",
+        f"  Missing thumbnails: {len(missing_thumbnails)}\n",
+        f"  Successfully generated: {len(generated_thumbnails)}\n",
+        f"  Failed to generate: {len(failed_thumbnails)}\n",
+        "\n",
+    ]
+    
+    # Every scanned path was built by joining onto target_path, so the
+    # relative form is a plain slice past the root prefix
+    prefix_len = len(os.path.join(str(target_path), ''))
+    
+    if generated_thumbnails:
+        parts.append("Successfully generated thumbnails:\n")
+        for video_file, png_path in generated_thumbnails:
+            parts.append(f"  {str(video_file)[prefix_len:]} -> {str(png_path)[prefix_len:]}\n")
+        parts.append("\n")
+    
+    if failed_thumbnails:
+        parts.append("Failed to generate thumbnails:\n")
+        for video_file, png_path in failed_thumbnails:
+            parts.append(f"  {str(video_file)[prefix_len:]} -> {str(png_path)[prefix_len:]}\n")
+        parts.append("\n")
+    
+    if missing_thumbnails and not generated_thumbnails:
+        parts.append("No thumbnails were generated (no missing pairs found).\n")
+        parts.append("\n")
+    
+    with open(report_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write("".join(parts))
     
     print(f"Report saved to: {report_path}")
     print()
     print("Summary:")
     print(f"  Video files found: {len(video_files)}")
-    print(f"  PNG files found: {len(png_files)}")
+    print(f"  Existing thumbnails: {existing_thumbnails}")
     print(f"  Missing thumbnails: {len(missing_thumbnails)}")
     print(f"  Successfully generated: {len(generated_thumbnails)}")
     print(f"  Failed to generate: {len(failed_thumbnails)}")
@@ -7,18 +7,166 @@ Handles migration of SQLite database from old schema to new schema.
 import sqlite3
 import uuid
 import os
+import re
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, NamedTuple
 from pathlib import Path
 
 from models import MigrationResult, ShotInfo, TakeInfo, AssetInfo
-from utils import convert_date_to_utc, update_file_path, generate_uuid
+from utils import convert_date_to_utc, update_file_path, iter_uuids, utc_now_iso, transaction_script
 from logger import create_migration_logger
 from schema_manager import SchemaManager
 
 logger = create_migration_logger('database')
 
+# Statements reused on every migration; keeping the text identical lets the
+# connection's statement cache hand back the already-compiled statement
+STATEMENT_CACHE_SIZE = 256
+
+# Larger pages mean fewer B-tree pages and splits when bulk-loading and
+# indexing the target
+TARGET_PAGE_SIZE = 8192
+
+# Page cache for the shared target connection (negative = KiB, so ~64 MB)
+TARGET_CACHE_SIZE_KIB = 64000
+
+# Start of the media directory in a normalized path. ASCII-only case folding
+# matches SQLite's lower() in _relative_media_path_sql
+MEDIA_DIR_PATTERN = re.compile('media/', re.IGNORECASE | re.ASCII)
+
+# Number of threads listing shot media folders for video_workflow entries
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _utc_date_sql(column: str) -> str:
+    """
+    Build an SQL expression converting a date column to UTC ISO 8601.
+    
+    Gives the same result as utils.convert_date_to_utc. Values ending in 'Z'
+    are kept, and the canonical forms of SOURCE_DATE_FORMATS are converted in
+    SQL when SQLite reads them back as the same date and time (so values it
+    would normalize, such as 2025-02-30, are not). Everything else, NULL
+    included, goes to convert_date_to_utc itself through the py_convert_date
+    function registered by DatabaseMigrator.migrate, keeping its parsing,
+    warning and current-time fallback.
+    
+    Args:
+        column: Column (or expression) holding the source date
+        
+    Returns:
+        SQL expression text
+    """
+    # The '+0 seconds' modifier makes SQLite normalize out-of-range fields
+    # (Feb 30, 24:00) instead of echoing them back. Years below 1000 stay
+    # with Python, which rejects year 0 and may not zero-pad the others
+    seconds = f"strftime('%Y-%m-%d %H:%M:%S', {column}, '+0 seconds')"
+    return f"""CASE
+        WHEN substr({column}, -1) = 'Z' THEN {column}
+        WHEN substr({column}, 1, 1) = '0' THEN py_convert_date({column})
+        WHEN length({column}) = 10 AND strftime('%Y-%m-%d', {column}, '+0 seconds') = {column}
+            THEN {column} || 'T00:00:00Z'
+        WHEN (length({column}) = 19
+              OR (length({column}) BETWEEN 21 AND 26 AND substr({column}, 20, 1) = '.'
+                  AND substr({column}, 21) NOT GLOB '*[^0-9]*'))
+             AND substr({column}, 11, 1) IN (' ', 'T')
+             AND {seconds} = substr({column}, 1, 10) || ' ' || substr({column}, 12, 8)
+            THEN replace({seconds}, ' ', 'T') || 'Z'
+        ELSE py_convert_date({column})
+    END"""
+
+
+def _relative_media_path_sql(column: str) -> str:
+    """
+    Build an SQL expression equivalent to DatabaseMigrator._extract_relative_path.
+    
+    Args:
+        column: Column holding the source file path
+        
+    Returns:
+        SQL expression giving the path from 'media/' onwards with forward
+        slashes, or the original value when it has no media directory
+    """
+    normalized = f"replace({column}, '\\', '/')"
+    media_index = f"instr(lower({normalized}), 'media/')"
+    return f"CASE WHEN {media_index} > 0 THEN substr({normalized}, {media_index}) ELSE {column} END"
+
+
+# Tables the source database must have (keep in step with the IN list in
+# _read_table_columns)
+REQUIRED_SOURCE_TABLES = frozenset(('shots', 'takes', 'assets', 'meta'))
+
+# Each SELECT_*_FROM_SOURCE_SQL yields rows for the matching *_COLUMNS and is
+# run by DatabaseMigrator._insert_from_source.
+#
+# Shots get consecutive ids in order_number order, continuing from the
+# offset bound as the only parameter
+SHOT_COLUMNS = (
+    'shot_id', 'order_number', 'shot_name', 'section', 'description',
+    'image_prompt', 'colour_scheme_image', 'time_of_day',
+    'location', 'country', 'year', 'video_prompt', 'created_date'
+)
+SELECT_SHOTS_FROM_SOURCE_SQL = f'''
+    SELECT ? + ROW_NUMBER() OVER (ORDER BY order_number),
+           order_number, shot_name, section, description,
+           image_prompt, colour_scheme_image, time_of_day,
+           location, country, year, video_prompt, {_utc_date_sql('created_date')}
+    FROM src.shots
+    ORDER BY order_number
+'''
+
+# Legacy take types that are not carried over
+LEGACY_TAKE_TYPES_SQL = "'mask_video', 'swapped_video'"
+
+# Takes are joined to the new shot ids (temp.shot_map, filled from the shot
+# mapping). py_uuid and py_update_path are registered on the connection by
+# _migrate_takes_table from utils.iter_uuids and utils.update_file_path.
+TAKE_COLUMNS = ('take_id', 'shot_id', 'take_type', 'file_path', 'starred', 'created_date')
+SELECT_TAKES_FROM_SOURCE_SQL = f'''
+    SELECT py_uuid(), m.shot_id, t.take_type,
+           CASE WHEN t.file_path IS NOT NULL
+                THEN py_update_path({_relative_media_path_sql('t.file_path')}, m.shot_id, t.shot_name)
+           END,
+           t.starred, {_utc_date_sql('t.created_date')}
+    FROM src.takes t
+    JOIN temp.shot_map m ON m.shot_name IS t.shot_name
+    WHERE COALESCE(t.take_type, '') NOT IN ({LEGACY_TAKE_TYPES_SQL})
+'''
+
+# Used by create_video_workflow_entries; module-level so the text stays
+# identical between calls and the statement cache can reuse it
+SELECT_VIDEO_WORKFLOW_TAKES_SQL = "SELECT shot_id, file_path FROM takes WHERE take_type = 'video_workflow'"
+INSERT_TAKE_SQL = f'''
+    INSERT INTO takes ({', '.join(TAKE_COLUMNS)})
+    VALUES ({', '.join('?' * len(TAKE_COLUMNS))})
+'''
+
+# Assets need no per-row Python work, so they are copied inside SQLite from
+# the attached source database
+ASSET_COLUMNS = ('id_key', 'asset_name', 'asset_type', 'file_path', 'starred', 'created_date')
+SELECT_ASSETS_FROM_SOURCE_SQL = f'''
+    SELECT id_key, asset_name, asset_type, {_relative_media_path_sql('file_path')},
+           starred, {_utc_date_sql('created_date')}
+    FROM src.assets
+'''
+
+def _list_folder(folder: str) -> Optional[List[str]]:
+    """
+    List the entry names in a folder.
+    
+    Args:
+        folder: Folder to list
+        
+    Returns:
+        Entry names, or None if the folder does not exist
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return [entry.name for entry in entries]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
 class DatabaseMigrator:
     """Handles database schema migration."""
     
@@ -37,6 +185,13 @@ class DatabaseMigrator:
         self.shot_mapping: Dict[str, int] = {}
         self.logger = create_migration_logger('database.migrator')
         
+        # Target column names per table, filled on first lookup
+        self._target_columns: Dict[str, frozenset] = {}
+        
+        # Target connection shared by migrate(), create_video_workflow_entries()
+        # and get_database_info(); opened on first use, released by close()
+        self._target_conn: Optional[sqlite3.Connection] = None
+        
         # Initialize schema manager
         self.schema_manager = SchemaManager(schema_path, meta_entries_path)
         self.logger.info(f"Using schema file: {schema_path}")
@@ -68,8 +223,9 @@ class DatabaseMigrator:
                     warnings=[]
                 )
             
-            # Create target database using schema manager
-            if not self.schema_manager.load_schema():
+            # Create target database using schema manager (the schema is
+            # usually loaded already by source validation; parse it only once)
+            if not self.schema_manager.schema_data and not self.schema_manager.load_schema():
                 return MigrationResult(
                     success=False,
                     shot_mapping={},
@@ -77,43 +233,62 @@ class DatabaseMigrator:
                     warnings=[]
                 )
             
-            if not self._create_target_database():
-                return MigrationResult(
-                    success=False,
-                    shot_mapping={},
-                    errors=["Failed to create target database from schema"],
-                    warnings=[]
-                )
-            
-            # Migrate tables
-            with sqlite3.connect(self.source_db_path) as source_conn:
-                with sqlite3.connect(self.target_db_path) as target_conn:
-                    # Migrate shots table
-                    shots_result = self._migrate_shots_table(source_conn, target_conn)
-                    if not shots_result.success:
-                        errors.extend(shots_result.errors)
-                        warnings.extend(shots_result.warnings)
-                    
-                    # Migrate takes table
-                    takes_result = self._migrate_takes_table(source_conn, target_conn)
-                    if not takes_result.success:
-                        errors.extend(takes_result.errors)
-                        warnings.extend(takes_result.warnings)
-                    
-                    # Migrate assets table
-                    assets_result = self._migrate_assets_table(source_conn, target_conn)
-                    if not assets_result.success:
-                        errors.extend(assets_result.errors)
-                        warnings.extend(assets_result.warnings)
-                    
-                    # Migrate meta table
-                    meta_result = self._migrate_meta_table(source_conn, target_conn)
-                    if not meta_result.success:
-                        errors.extend(meta_result.errors)
-                        warnings.extend(meta_result.warnings)
-                    
-                    # Create indexes
-                    self._create_indexes(target_conn)
+            # One target connection serves the whole migration: schema
+            # creation, then the table phases with the source attached as
+            # 'src' (autocommit mode; each table phase manages its own explicit
+            # transaction). The source is attached read-only and memory-mapped,
+            # as the migration never writes to it.
+            target_dir = os.path.dirname(self.target_db_path)
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+            source_uri = Path(self.source_db_path).resolve().as_uri() + '?mode=ro'
+            with self._target_connection() as conn:
+                self._begin_bulk_load(conn)
+                
+                if not self._create_target_database(conn):
+                    # Drop the connection so the exclusive lock goes with it
+                    self.close()
+                    return MigrationResult(
+                        success=False,
+                        shot_mapping={},
+                        errors=["Failed to create target database from schema"],
+                        warnings=[]
+                    )
+                
+                conn.execute('ATTACH DATABASE ? AS src', (source_uri,))
+                # Dates _utc_date_sql cannot convert in SQL are handed to Python
+                conn.create_function('py_convert_date', 1, convert_date_to_utc, deterministic=False)
+                conn.execute('PRAGMA src.mmap_size=268435456')
+                dropped_indexes = self._drop_indexes(conn)
+                
+                # Migrate shots table
+                shots_result = self._migrate_shots_table(conn)
+                if not shots_result.success:
+                    errors.extend(shots_result.errors)
+                    warnings.extend(shots_result.warnings)
+                
+                # Migrate takes table
+                takes_result = self._migrate_takes_table(conn)
+                if not takes_result.success:
+                    errors.extend(takes_result.errors)
+                    warnings.extend(takes_result.warnings)
+                
+                # Migrate assets table
+                assets_result = self._migrate_assets_table(conn)
+                if not assets_result.success:
+                    errors.extend(assets_result.errors)
+                    warnings.extend(assets_result.warnings)
+                
+                # Migrate meta table
+                meta_result = self._migrate_meta_table(conn)
+                if not meta_result.success:
+                    errors.extend(meta_result.errors)
+                    warnings.extend(meta_result.warnings)
+                
+                # Create indexes now the data is in, then refresh planner stats
+                self._create_indexes(conn, dropped_indexes)
+                self._end_bulk_load(conn)
+                conn.execute('DETACH DATABASE src')
             
             success = len(errors) == 0
             self.logger.info(f"Database migration completed: {'SUCCESS' if success else 'FAILED'}")
@@ -128,6 +303,9 @@ class DatabaseMigrator:
         except Exception as e:
             error_msg = f"Database migration failed: {e}"
             self.logger.error(error_msg)
+            # Don't keep a connection that may still hold the bulk-load lock
+            # or the attached source
+            self.close()
             return MigrationResult(
                 success=False,
                 shot_mapping={},
@@ -135,6 +313,32 @@ class DatabaseMigrator:
                 warnings=[]
             )
     
+    def _target_connection(self) -> sqlite3.Connection:
+        """
+        Get the shared target database connection, opening it on first use.
+        
+        The connection runs in autocommit mode (callers issue BEGIN/COMMIT
+        themselves) and is opened with URI support for the source ATTACH.
+        Temp B-trees and a larger page cache are kept in memory for the
+        connection's lifetime; durability settings are left at their defaults
+        outside the bulk load.
+        
+        Returns:
+            Open SQLite connection to the target database
+        """
+        if self._target_conn is None:
+            self._target_conn = sqlite3.connect(self.target_db_path, isolation_level=None,
+                                                cached_statements=STATEMENT_CACHE_SIZE, uri=True)
+            self._target_conn.execute('PRAGMA temp_store=MEMORY')
+            self._target_conn.execute(f'PRAGMA cache_size=-{TARGET_CACHE_SIZE_KIB}')
+        return self._target_conn
+    
+    def close(self):
+        """Close the shared target database connection, if open."""
+        if self._target_conn is not None:
+            self._target_conn.close()
+            self._target_conn = None
+    
     def _validate_source_database(self) -> bool:
         """Validate source database structure and create missing tables."""
         try:
@@ -144,15 +348,8 @@ class DatabaseMigrator:
             
             with sqlite3.connect(self.source_db_path) as conn:
                 # Check required tables
-                required_tables = ['shots', 'takes', 'assets', 'meta']
-                cursor = conn.execute("""
-                    SELECT name FROM sqlite_master
-                    WHERE type='table' AND name IN ({})
-                """.format(','.join(['?'] * len(required_tables))), required_tables)
-                
-                existing_tables = {row[0] for row in cursor.fetchall()}
-                
-                missing_tables = set(required_tables) - existing_tables
+                table_columns = self._read_table_columns(conn)
+                missing_tables = REQUIRED_SOURCE_TABLES - table_columns.keys()
                 if missing_tables:
                     self.logger.warning(f"Missing required tables: {missing_tables}")
                     self.logger.info("Creating missing tables...")
@@ -169,12 +366,13 @@ class DatabaseMigrator:
                     
                     conn.commit()
                     self.logger.info(f"Created missing tables: {missing_tables}")
+                    table_columns = self._read_table_columns(conn)
                 
                 # Validate table schemas and log schema mismatches
-                self._validate_table_schemas(conn)
+                self._validate_table_schemas(table_columns)
                 
                 # Adapt source schema to match target schema
-                if not self._adapt_source_schema(conn):
+                if not self._adapt_source_schema(conn, table_columns):
                     self.logger.error("Source schema adaptation failed")
                     return False
                 
@@ -185,10 +383,32 @@ class DatabaseMigrator:
             self.logger.error(f"Source database validation failed: {e}")
             return False
     
-    def _validate_table_schemas(self, conn) -> None:
+    def _read_table_columns(self, conn) -> Dict[str, set]:
+        """
+        Read the column names of the required tables with a single query.
+        
+        Args:
+            conn: SQLite connection
+            
+        Returns:
+            Dictionary mapping table name to its set of column names
+        """
+        table_columns = {}
+        for table_name, column_name in conn.execute("""
+            SELECT m.name, p.name
+            FROM sqlite_master AS m, pragma_table_info(m.name) AS p
+            WHERE m.type = 'table' AND m.name IN ('shots', 'takes', 'assets', 'meta')
+        """):
+            table_columns.setdefault(table_name, set()).add(column_name)
+        return table_columns
+    
+    def _validate_table_schemas(self, table_columns: Dict[str, set]) -> None:
         """
         Validate source database table schemas against target schema.
         Logs additional and missing columns as ERROR entries.
+        
+        Args:
+            table_columns: Source table name to column names, from _read_table_columns
         """
         try:
             # Load target schema if not already loaded
@@ -201,21 +421,17 @@ class DatabaseMigrator:
             tables_to_validate = ['shots', 'takes', 'assets']
             
             for table_name in tables_to_validate:
-                self._validate_table_schema(conn, table_name)
+                self._validate_table_schema(table_name, table_columns.get(table_name, set()))
                 
         except Exception as e:
             self.logger.error(f"Table schema validation failed: {e}")
     
-    def _validate_table_schema(self, conn, table_name: str) -> None:
+    def _validate_table_schema(self, table_name: str, source_columns: set) -> None:
         """
         Validate a specific table schema against target schema.
         Logs additional and missing columns as ERROR entries.
         """
         try:
-            # Get source table columns
-            cursor = conn.execute(f"PRAGMA table_info({table_name})")
-            source_columns = {row[1] for row in cursor.fetchall()}
-            
             # Get target table columns from schema
             target_columns = self._get_target_table_columns(table_name)
             
@@ -244,31 +460,39 @@ class DatabaseMigrator:
         except Exception as e:
             self.logger.error(f"Failed to validate schema for table '{table_name}': {e}")
     
-    def _get_target_table_columns(self, table_name: str) -> set:
+    def _get_target_table_columns(self, table_name: str) -> frozenset:
         """
         Get column names for a target table from schema.
         
+        The names are read from the schema once per table and cached, as both
+        validation and schema adaptation look them up.
+        
         Args:
             table_name: Name of the table
             
         Returns:
-            Set of column names
+            Frozen set of column names
         """
+        column_names = self._target_columns.get(table_name)
+        if column_names is not None:
+            return column_names
+        
         try:
             # Get columns from schema
             columns_key = f"{table_name}_columns"
             columns_data = self.schema_manager.schema_data['tables'].get(columns_key, [])
             
             # Extract column names
-            column_names = {col['name'] for col in columns_data}
+            column_names = frozenset(col['name'] for col in columns_data)
+            self._target_columns[table_name] = column_names
             
             return column_names
             
         except Exception as e:
             self.logger.error(f"Failed to get target columns for table '{table_name}': {e}")
-            return set()
+            return frozenset()
     
-    def _adapt_source_schema(self, conn) -> bool:
+    def _adapt_source_schema(self, conn, table_columns: Dict[str, set]) -> bool:
         """
         Adapt source database schema to match target schema.
         Drops additional columns and adds missing columns.
@@ -276,6 +500,7 @@ class DatabaseMigrator:
         
         Args:
             conn: SQLite connection to source database
+            table_columns: Source table name to column names, from _read_table_columns
             
         Returns:
             True if successful, False otherwise
@@ -287,7 +512,7 @@ class DatabaseMigrator:
             tables_to_adapt = ['shots', 'takes', 'assets']
             
             for table_name in tables_to_adapt:
-                if not self._adapt_table_schema(conn, table_name):
+                if not self._adapt_table_schema(conn, table_name, table_columns.get(table_name, set())):
                     self.logger.error(f"Failed to adapt schema for table: {table_name}")
                     return False
             
@@ -298,22 +523,19 @@ class DatabaseMigrator:
             self.logger.error(f"Schema adaptation failed: {e}")
             return False
     
-    def _adapt_table_schema(self, conn, table_name: str) -> bool:
+    def _adapt_table_schema(self, conn, table_name: str, current_columns: set) -> bool:
         """
         Adapt a specific table schema to match target schema.
         
         Args:
             conn: SQLite connection
             table_name: Name of the table to adapt
+            current_columns: Current column names of the table
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Get current table columns
-            cursor = conn.execute(f"PRAGMA table_info({table_name})")
-            current_columns = {row[1] for row in cursor.fetchall()}
-            
             # Get target table columns
             target_columns = self._get_target_table_columns(table_name)
             
@@ -460,7 +682,7 @@ class DatabaseMigrator:
                     # Update existing rows with appropriate values
                     if col_name == 'created_date':
                         # Set created_date to current timestamp for existing rows
-                        current_time = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+                        current_time = utc_now_iso()
                         conn.execute(f"UPDATE {table_name} SET created_date = ? WHERE created_date IS NULL", (current_time,))
                     elif col_info.get('default_value') is not None:
                         # Set other default values
@@ -492,10 +714,13 @@ class DatabaseMigrator:
     
     # Note: _create_meta_table method removed - now handled by schema_manager.create_meta_table_with_entries()
     
-    def _create_target_database(self) -> bool:
+    def _create_target_database(self, conn) -> bool:
         """
         Create target database using schema from JSON file.
         
+        Args:
+            conn: Open connection to the target database
+            
         Returns:
             True if successful, False otherwise
         """
@@ -503,7 +728,7 @@ class DatabaseMigrator:
         
         try:
             # Check if database already exists and has the correct schema
-            if self._database_schema_exists():
+            if self._database_schema_exists(conn):
                 self.logger.info("Target database already exists with correct schema")
                 return True
             
@@ -513,27 +738,29 @@ class DatabaseMigrator:
                     self.logger.error("Failed to load schema")
                     return False
             
-            # Use schema manager to create database
-            success = self.schema_manager.create_database_from_schema(self.target_db_path)
+            # Use schema manager to create database; indexes are built after
+            # the data load by _create_indexes, which is much cheaper than
+            # maintaining them row by row
+            success = self.schema_manager.create_database_from_schema(self.target_db_path,
+                                                                      create_indexes=False,
+                                                                      page_size=TARGET_PAGE_SIZE,
+                                                                      conn=conn)
             
             if success:
                 self.logger.info("Target database schema created successfully from schema file")
                 
                 # Create meta table with entries using schema manager
-                with sqlite3.connect(self.target_db_path) as conn:
-                    meta_success = self.schema_manager.create_meta_table_with_entries(conn)
-                    if not meta_success:
-                        self.logger.error("Failed to create meta table with entries")
-                        return False
+                meta_success = self.schema_manager.create_meta_table_with_entries(conn)
+                if not meta_success:
+                    self.logger.error("Failed to create meta table with entries")
+                    return False
                 
                 # Validate the created database
-                validation_results = self.schema_manager.validate_database_schema(self.target_db_path)
-                if not validation_results['valid']:
+                # (indexes are expected to be missing until after the data load)
+                validation_results = self.schema_manager.validate_database_schema(self.target_db_path, conn)
+                if validation_results['missing_tables']:
                     self.logger.warning("Database created but validation found issues:")
-                    if validation_results['missing_tables']:
-                        self.logger.warning(f"  Missing tables: {validation_results['missing_tables']}")
-                    if validation_results['missing_indexes']:
-                        self.logger.warning(f"  Missing indexes: {validation_results['missing_indexes']}")
+                    self.logger.warning(f"  Missing tables: {validation_results['missing_tables']}")
                 
                 return True
             else:
@@ -544,88 +771,121 @@ class DatabaseMigrator:
             self.logger.error(f"Error creating target database: {e}")
             return False
     
-    def _database_schema_exists(self) -> bool:
+    def _database_schema_exists(self, conn) -> bool:
         """
         Check if the target database already exists with the correct schema.
         
+        Args:
+            conn: Open connection to the target database (a new, empty
+                database simply has no tables)
+            
         Returns:
             True if database exists with correct schema, False otherwise
         """
         try:
-            if not os.path.exists(self.target_db_path):
-                return False
-            
-            # Validate the existing database schema
-            validation_results = self.schema_manager.validate_database_schema(self.target_db_path)
-            
-            return validation_results['valid']
+            # Validate the existing database schema. Indexes are created after
+            # the data load, so a database still missing them counts as existing.
+            validation_results = self.schema_manager.validate_database_schema(self.target_db_path, conn)
+            
+            return (
+                'error' not in validation_results
+                and not validation_results['missing_tables']
+                and all(table['valid'] for table in validation_results['table_validations'].values())
+            )
             
         except Exception as e:
             self.logger.warning(f"Could not validate existing database: {e}")
             return False
     
-    def _migrate_shots_table(self, source_conn, target_conn) -> MigrationResult:
-        """Migrate shots table with schema transformation."""
+    def _insert_from_source(self, conn, table_name: str, columns, select_sql: str,
+                            describe_row, errors: List[str], params=()) -> int:
+        """
+        Copy rows into a target table with one INSERT ... SELECT.
+        
+        If the bulk statement hits a constraint violation it is rolled back to
+        a savepoint and the rows are inserted one at a time instead, so only
+        the offending rows are reported and the rest are still migrated.
+        
+        Args:
+            conn: Target connection with the source attached as 'src'
+            table_name: Table in the target database
+            columns: Target column names, in select order
+            select_sql: SELECT producing the rows to insert
+            describe_row: Returns a label for a row, used in error messages
+            errors: List that per-row failures are appended to
+            params: Parameters for select_sql
+            
+        Returns:
+            Number of rows inserted
+        """
+        column_list = ', '.join(columns)
+        
+        conn.execute('BEGIN')
+        try:
+            conn.execute('SAVEPOINT bulk_insert')
+            try:
+                inserted = conn.execute(
+                    f'INSERT INTO main.{table_name} ({column_list}) {select_sql}', params
+                ).rowcount
+            except sqlite3.IntegrityError as e:
+                conn.execute('ROLLBACK TO bulk_insert')
+                self.logger.warning(f"Bulk insert into {table_name} failed ({e}), retrying row by row")
+                
+                insert_row_sql = (f'INSERT INTO main.{table_name} ({column_list}) '
+                                  f'VALUES ({", ".join("?" * len(columns))})')
+                inserted = 0
+                for row in conn.execute(select_sql, params):
+                    try:
+                        conn.execute(insert_row_sql, row)
+                        inserted += 1
+                    except sqlite3.IntegrityError as row_error:
+                        error_msg = f"Failed to migrate {describe_row(row)}: {row_error}"
+                        errors.append(error_msg)
+                        self.logger.error(error_msg)
+            conn.execute('RELEASE bulk_insert')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        
+        return inserted
+    
+    def _migrate_shots_table(self, conn) -> MigrationResult:
+        """Migrate shots table from the attached source database with schema transformation."""
         errors = []
         warnings = []
         
         try:
             self.logger.info("Migrating shots table")
             
-            # Get shots ordered by order_number
-            cursor = source_conn.execute('''
-                SELECT order_number, shot_name, section, description, 
-                       image_prompt, colour_scheme_image, time_of_day,
-                       location, country, year, video_prompt, created_date
-                FROM shots 
-                ORDER BY order_number
-            ''')
-            
-            shots_data = cursor.fetchall()
-            total_shots = len(shots_data)
+            total_shots = conn.execute('SELECT COUNT(*) FROM src.shots').fetchone()[0]
             
             if total_shots == 0:
                 warnings.append("No shots found in source database")
                 return MigrationResult(success=True, shot_mapping={}, errors=[], warnings=warnings)
             
-            # Insert into new table
-            for i, row in enumerate(shots_data):
-                order_number, shot_name, section, description, image_prompt, \
-                colour_scheme_image, time_of_day, location, country, year, \
-                video_prompt, created_date = row
-                
-                # Convert date format
-                converted_date = convert_date_to_utc(created_date)
-                
-                try:
-                    # Insert into new table
-                    target_conn.execute('''
-                        INSERT INTO shots (
-                            order_number, shot_name, section, description,
-                            image_prompt, colour_scheme_image, time_of_day,
-                            location, country, year, video_prompt, created_date
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (order_number, shot_name, section, description,
-                          image_prompt, colour_scheme_image, time_of_day,
-                          location, country, year, video_prompt, converted_date))
-                    
-                    # Get the new shot_id
-                    new_shot_id = target_conn.execute('SELECT last_insert_rowid()').fetchone()[0]
-                    
-                    # Store mapping
-                    self.shot_mapping[shot_name] = new_shot_id
-                    
-                except Exception as e:
-                    error_msg = f"Failed to migrate shot {shot_name}: {e}"
-                    errors.append(error_msg)
-                    self.logger.error(error_msg)
-                
-                # Log progress
-                if (i + 1) % 50 == 0 or i == total_shots - 1:
-                    progress = ((i + 1) / total_shots) * 100
-                    self.logger.info(f"Shots migration progress: {progress:.1f}% ({i+1}/{total_shots})")
+            # Shots are numbered in order inside the INSERT ... SELECT, so their
+            # ids are known without last_insert_rowid(). Start after any
+            # existing rows, as AUTOINCREMENT never reuses an id.
+            first_shot_id = conn.execute('''
+                SELECT MAX(
+                    COALESCE((SELECT MAX(shot_id) FROM main.shots), 0),
+                    COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = 'shots'), 0)
+                ) + 1
+            ''').fetchone()[0]
+            
+            self._insert_from_source(
+                conn, 'shots', SHOT_COLUMNS, SELECT_SHOTS_FROM_SOURCE_SQL,
+                lambda row: f"shot {row[2]}", errors, (first_shot_id - 1,)
+            )
             
-            target_conn.commit()
+            # Store mapping (ordered by id so a repeated shot name keeps its
+            # last shot, as before)
+            self.shot_mapping.update(conn.execute(
+                'SELECT shot_name, shot_id FROM main.shots WHERE shot_id >= ? ORDER BY shot_id',
+                (first_shot_id,)
+            ))
+            self.logger.info(f"Shots migrated: {total_shots}")
             
             success = len(errors) == 0
             self.logger.info(f"Shots table migration completed: {'SUCCESS' if success else 'FAILED'}")
@@ -643,77 +903,72 @@ class DatabaseMigrator:
             self.logger.error(error_msg)
             return MigrationResult(success=False, shot_mapping={}, errors=errors, warnings=warnings)
     
-    def _migrate_takes_table(self, source_conn, target_conn) -> MigrationResult:
-        """Migrate takes table with new schema."""
+    def _migrate_takes_table(self, conn) -> MigrationResult:
+        """Migrate takes table from the attached source database with new schema."""
         errors = []
         warnings = []
         
         try:
             self.logger.info("Migrating takes table")
             
-            # Get takes from old table
-            cursor = source_conn.execute('''
-                SELECT shot_name, take_type, file_path, starred, created_date
-                FROM takes
-            ''')
-            
-            takes_data = cursor.fetchall()
-            total_takes = len(takes_data)
+            total_takes = conn.execute('SELECT COUNT(*) FROM src.takes').fetchone()[0]
             
             if total_takes == 0:
                 warnings.append("No takes found in source database")
                 return MigrationResult(success=True, shot_mapping={}, errors=[], warnings=warnings)
             
-            # Insert into new table
-            for i, row in enumerate(takes_data):
-                shot_name, take_type, file_path, starred, created_date = row
-                
-                # Skip legacy take types
-                if take_type in ['mask_video', 'swapped_video']:
-                    warning_msg = f"Excluding legacy take_type '{take_type}' for shot {shot_name}"
-                    self.logger.warning(warning_msg)
-                    continue
+            # Report the rows that are skipped, the same way the per-row
+            # migration used to (these scans only feed the log, so they are
+            # skipped when it would discard them)
+            if self.logger.isEnabledFor(logging.WARNING):
+                for shot_name, take_type in conn.execute(f'''
+                    SELECT shot_name, take_type FROM src.takes
+                    WHERE take_type IN ({LEGACY_TAKE_TYPES_SQL})
+                '''):
+                    self.logger.warning(f"Excluding legacy take_type '{take_type}' for shot {shot_name}")
+            
+            # Let SQLite call the Python helpers directly while it scans, so
+            # the whole phase stays a single INSERT ... SELECT
+            take_ids = iter_uuids()
+            conn.create_function('py_uuid', 0, take_ids.__next__, deterministic=False)
+            conn.create_function('py_update_path', 3, update_file_path, deterministic=True)
+            
+            # The shot_id lookup happens in SQL against the mapping built by
+            # the shots phase
+            conn.execute('CREATE TEMP TABLE shot_map (shot_name TEXT PRIMARY KEY, shot_id INTEGER)')
+            try:
+                conn.executemany('INSERT INTO temp.shot_map (shot_name, shot_id) VALUES (?, ?)',
+                                 self.shot_mapping.items())
                 
-                # Get shot_id from mapping
-                if shot_name not in self.shot_mapping:
+                for (shot_name,) in conn.execute(f'''
+                    SELECT t.shot_name FROM src.takes t
+                    WHERE COALESCE(t.take_type, '') NOT IN ({LEGACY_TAKE_TYPES_SQL})
+                      AND NOT EXISTS (SELECT 1 FROM temp.shot_map m WHERE m.shot_name IS t.shot_name)
+                '''):
                     error_msg = f"Shot name {shot_name} not found in mapping"
                     errors.append(error_msg)
                     self.logger.warning(error_msg)
-                    continue
-                
-                shot_id = self.shot_mapping[shot_name]
-                
-                # Generate UUID for take_id
-                take_id = generate_uuid()
                 
-                # Convert date format
-                converted_date = convert_date_to_utc(created_date)
+                if self.logger.isEnabledFor(logging.ERROR):
+                    for (file_path,) in conn.execute(f'''
+                        SELECT t.file_path
+                        FROM src.takes t JOIN temp.shot_map m ON m.shot_name IS t.shot_name
+                        WHERE COALESCE(t.take_type, '') NOT IN ({LEGACY_TAKE_TYPES_SQL})
+                          AND instr(lower(replace(t.file_path, '\\', '/')), 'media/') = 0
+                    '''):
+                        self.logger.error(f"ERROR: Could not find 'media' directory in file path: {file_path}")
                 
-                # Extract relative path from full file path
-                relative_file_path = self._extract_relative_path(file_path)
-                
-                # Update file_path to use shot_id
-                new_file_path = update_file_path(relative_file_path, shot_id, shot_name)
-                
-                try:
-                    # Insert into new table
-                    target_conn.execute('''
-                        INSERT INTO takes (
-                            take_id, shot_id, take_type, file_path, starred, created_date
-                        ) VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (take_id, shot_id, take_type, new_file_path, starred, converted_date))
-                    
-                except Exception as e:
-                    error_msg = f"Failed to migrate take for shot {shot_name}: {e}"
-                    errors.append(error_msg)
-                    self.logger.error(error_msg)
-                
-                # Log progress
-                if (i + 1) % 100 == 0 or i == total_takes - 1:
-                    progress = ((i + 1) / total_takes) * 100
-                    self.logger.info(f"Takes migration progress: {progress:.1f}% ({i+1}/{total_takes})")
+                # Error labels name the source shot, not the new shot_id
+                # (temp.shot_map holds one id per name, so this inverts it)
+                shot_names = {shot_id: shot_name for shot_name, shot_id in self.shot_mapping.items()}
+                migrated_takes = self._insert_from_source(
+                    conn, 'takes', TAKE_COLUMNS, SELECT_TAKES_FROM_SOURCE_SQL,
+                    lambda row: f"take for shot {shot_names[row[1]]}", errors
+                )
+            finally:
+                conn.execute('DROP TABLE temp.shot_map')
             
-            target_conn.commit()
+            self.logger.info(f"Takes migrated: {migrated_takes}/{total_takes}")
             
             success = len(errors) == 0
             self.logger.info(f"Takes table migration completed: {'SUCCESS' if success else 'FAILED'}")
@@ -731,56 +986,38 @@ class DatabaseMigrator:
             self.logger.error(error_msg)
             return MigrationResult(success=False, shot_mapping={}, errors=errors, warnings=warnings)
     
-    def _migrate_assets_table(self, source_conn, target_conn) -> MigrationResult:
-        """Migrate assets table."""
+    def _migrate_assets_table(self, conn) -> MigrationResult:
+        """Migrate assets table from the attached source database."""
         errors = []
         warnings = []
         
         try:
             self.logger.info("Migrating assets table")
             
-            # Get assets from old table
-            cursor = source_conn.execute('''
-                SELECT id_key, asset_name, asset_type, file_path, starred, created_date
-                FROM assets
-            ''')
-            
-            assets_data = cursor.fetchall()
-            total_assets = len(assets_data)
-            
-            if total_assets == 0:
+            # Decide "no assets" from the source, not the inserted count, so
+            # rows that all fail to insert are still reported as errors
+            (source_assets,) = conn.execute("SELECT COUNT(*) FROM src.assets").fetchone()
+            if source_assets == 0:
                 warnings.append("No assets found in source database")
                 return MigrationResult(success=True, shot_mapping={}, errors=[], warnings=warnings)
             
-            # Insert into new table
-            for i, row in enumerate(assets_data):
-                id_key, asset_name, asset_type, file_path, starred, created_date = row
-                
-                # Extract relative path from full file path
-                relative_file_path = self._extract_relative_path(file_path)
-                
-                # Convert date format
-                converted_date = convert_date_to_utc(created_date)
-                
-                try:
-                    # Insert into new table
-                    target_conn.execute('''
-                        INSERT INTO assets (
-                            id_key, asset_name, asset_type, file_path, starred, created_date
-                        ) VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (id_key, asset_name, asset_type, relative_file_path, starred, converted_date))
-                    
-                except Exception as e:
-                    error_msg = f"Failed to migrate asset {id_key}: {e}"
-                    errors.append(error_msg)
-                    self.logger.error(error_msg)
-                
-                # Log progress
-                if (i + 1) % 50 == 0 or i == total_assets - 1:
-                    progress = ((i + 1) / total_assets) * 100
-                    self.logger.info(f"Assets migration progress: {progress:.1f}% ({i+1}/{total_assets})")
+            # Report the paths the SQL conversion leaves unchanged, the same
+            # way _extract_relative_path does (dates the SQL cannot convert go
+            # through convert_date_to_utc, which reports them itself)
+            if self.logger.isEnabledFor(logging.ERROR):
+                cursor = conn.execute("""
+                    SELECT file_path FROM src.assets
+                    WHERE instr(lower(replace(file_path, '\\', '/')), 'media/') = 0
+                """)
+                for (file_path,) in cursor:
+                    self.logger.error(f"ERROR: Could not find 'media' directory in file path: {file_path}")
             
-            target_conn.commit()
+            total_assets = self._insert_from_source(
+                conn, 'assets', ASSET_COLUMNS, SELECT_ASSETS_FROM_SOURCE_SQL,
+                lambda row: f"asset {row[0]}", errors
+            )
+            
+            self.logger.info(f"Assets migrated: {total_assets}")
             
             success = len(errors) == 0
             self.logger.info(f"Assets table migration completed: {'SUCCESS' if success else 'FAILED'}")
@@ -798,8 +1035,8 @@ class DatabaseMigrator:
             self.logger.error(error_msg)
             return MigrationResult(success=False, shot_mapping={}, errors=errors, warnings=warnings)
     
-    def _migrate_meta_table(self, source_conn, target_conn) -> MigrationResult:
-        """Migrate meta table with version validation."""
+    def _migrate_meta_table(self, conn) -> MigrationResult:
+        """Migrate meta table from the attached source database with version validation."""
         errors = []
         warnings = []
         
@@ -814,79 +1051,81 @@ class DatabaseMigrator:
                     self.logger.error(error_msg)
                     return MigrationResult(success=False, shot_mapping={}, errors=errors, warnings=warnings)
             
-            # Get meta data from old table
-            cursor = source_conn.execute('SELECT key, value FROM meta')
-            meta_data = cursor.fetchall()
-            
-            # Process existing meta data
-            existing_meta = {}
-            for key, value in meta_data:
-                existing_meta[key] = value
-            
             # Get meta entries configuration
             meta_entries_config = self.schema_manager.meta_entries_data['meta_entries']
+            config_keys = list(meta_entries_config)
+            placeholders = ', '.join('?' * len(config_keys))
             
-            # Process each meta entry based on configuration
-            for key, config in meta_entries_config.items():
-                if key in existing_meta:
-                    # Handle existing entries
-                    value = existing_meta[key]
-                    
-                    # Validate version numbers
-                    if key == 'schema_version':
-                        value = '1'  # Force to 1
-                    elif key == 'app_version':
-                        value = '1.0'  # Force to 1.0
-                    
-                    # Convert created_at date format
-                    if key == 'created_at':
-                        value = convert_date_to_utc(value)
+            # One timestamp for every entry stamped by this migration
+            now_iso = utc_now_iso()
+            
+            conn.execute('BEGIN')
+            try:
+                # Copy the configured entries that exist in the source in one
+                # statement, forcing the version numbers and converting created_at
+                existing_meta = {}
+                try:
+                    conn.execute(f'''
+                        INSERT OR REPLACE INTO main.meta (key, value)
+                        SELECT key,
+                               CASE key
+                                   WHEN 'schema_version' THEN '1'
+                                   WHEN 'app_version' THEN '1.0'
+                                   WHEN 'created_at' THEN {_utc_date_sql('value')}
+                                   ELSE value
+                               END
+                        FROM src.meta
+                        WHERE key IN ({placeholders})
+                    ''', config_keys)
                     
-                    try:
-                        target_conn.execute('''
-                            INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)
-                        ''', (key, value))
+                    existing_meta = dict(conn.execute(f'''
+                        SELECT key, value FROM main.meta
+                        WHERE key IN (SELECT key FROM src.meta WHERE key IN ({placeholders}))
+                    ''', config_keys))
+                    for key, value in existing_meta.items():
                         self.logger.info(f"Migrated meta entry: {key} = {value}")
                         
-                    except Exception as e:
-                        error_msg = f"Failed to migrate meta key {key}: {e}"
-                        errors.append(error_msg)
-                        self.logger.error(error_msg)
+                except Exception as e:
+                    error_msg = f"Failed to migrate meta entries: {e}"
+                    errors.append(error_msg)
+                    self.logger.error(error_msg)
                 
-                else:
-                    # Handle missing entries based on configuration
-                    if config.get('create_if_missing', False):
+                # Handle entries missing from the source based on configuration
+                missing_entries = []
+                for key, config in meta_entries_config.items():
+                    if key not in existing_meta and config.get('create_if_missing', False):
                         value = config['value']
                         
                         # Handle dynamic values
                         if config.get('dynamic', False) and value == 'CURRENT_UTC_ISO8601':
-                            value = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+                            value = now_iso
                         
-                        try:
-                            target_conn.execute('''
-                                INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)
-                            ''', (key, value))
-                            self.logger.info(f"Created missing meta entry: {key} = {value}")
-                            
-                        except Exception as e:
-                            error_msg = f"Failed to create meta key {key}: {e}"
-                            errors.append(error_msg)
-                            self.logger.error(error_msg)
-            
-            # Always update migration_date (overwrite existing)
-            migration_date = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-            try:
-                target_conn.execute('''
-                    INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)
-                ''', ('migration_date', migration_date))
-                self.logger.info(f"Updated migration_date: {migration_date}")
+                        missing_entries.append((key, value))
                 
-            except Exception as e:
-                error_msg = f"Failed to update migration_date: {e}"
-                errors.append(error_msg)
-                self.logger.error(error_msg)
-            
-            target_conn.commit()
+                # Write the missing entries and migration_date in one statement:
+                # missing entries are only added, while migration_date always
+                # overwrites the existing value
+                meta_entries = missing_entries + [('migration_date', now_iso)]
+                try:
+                    conn.executemany('''
+                        INSERT INTO meta (key, value) VALUES (?, ?)
+                        ON CONFLICT (key) DO UPDATE SET value = excluded.value
+                        WHERE excluded.key = 'migration_date'
+                    ''', meta_entries)
+                    for key, value in missing_entries:
+                        self.logger.info(f"Created missing meta entry: {key} = {value}")
+                    self.logger.info(f"Updated migration_date: {now_iso}")
+                    
+                except Exception as e:
+                    error_msg = f"Failed to write meta keys {', '.join(key for key, _ in meta_entries)}: {e}"
+                    errors.append(error_msg)
+                    self.logger.error(error_msg)
+                
+                conn.commit()
+            except Exception:
+                # Do not leave the transaction open on the shared connection
+                conn.rollback()
+                raise
             
             success = len(errors) == 0
             self.logger.info(f"Meta table migration completed: {'SUCCESS' if success else 'FAILED'}")
@@ -904,11 +1143,94 @@ class DatabaseMigrator:
             self.logger.error(error_msg)
             return MigrationResult(success=False, shot_mapping={}, errors=errors, warnings=warnings)
     
-    def _create_indexes(self, conn):
-        """Create performance indexes."""
+    def _begin_bulk_load(self, conn):
+        """
+        Relax durability on the target connection for the initial data load.
+        
+        The target is a fresh copy that is rebuilt from the source if the run
+        fails, so fsyncs and on-disk journaling only slow the load down. The
+        journal is kept in memory rather than turned off so per-table
+        rollbacks still work.
+        """
+        conn.execute('PRAGMA main.journal_mode=MEMORY')
+        conn.execute('PRAGMA main.synchronous=OFF')
+        conn.execute('PRAGMA main.locking_mode=EXCLUSIVE')
+        conn.execute('PRAGMA cache_size=-262144')
+        conn.execute('PRAGMA main.mmap_size=268435456')
+    
+    def _end_bulk_load(self, conn):
+        """Gather planner statistics and restore normal durability settings."""
+        try:
+            conn.execute('ANALYZE main')
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to analyze target database: {e}")
+        
+        conn.execute('PRAGMA main.journal_mode=DELETE')
+        conn.execute('PRAGMA main.synchronous=FULL')
+        # Takes effect (releasing the exclusive lock) on the next access
+        conn.execute('PRAGMA main.locking_mode=NORMAL')
+        conn.execute('PRAGMA main.mmap_size=0')
+        conn.execute(f'PRAGMA cache_size=-{TARGET_CACHE_SIZE_KIB}')
+        conn.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchall()
+    
+    def _drop_indexes(self, conn) -> Dict[str, str]:
+        """
+        Drop the indexes on the migrated tables of an existing target.
+        
+        A freshly created target has none (they are deferred until after the
+        data load), but a target reused from an earlier run would otherwise
+        maintain every index row by row during the bulk load.
+        
+        Returns:
+            Dictionary mapping dropped index names to their CREATE statements
+        """
+        dropped_indexes = dict(conn.execute('''
+            SELECT name, sql FROM main.sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+              AND tbl_name IN ('shots', 'takes', 'assets')
+        '''))
+        if not dropped_indexes:
+            return {}
+        
+        self.logger.info(f"Dropping {len(dropped_indexes)} existing indexes for the data load")
+        try:
+            conn.executescript(transaction_script(
+                f'DROP INDEX main."{index_name}"' for index_name in dropped_indexes
+            ))
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.logger.warning(f"Failed to drop indexes: {e}")
+            return {}
+        
+        return dropped_indexes
+    
+    def _create_indexes(self, conn, dropped_indexes: Optional[Dict[str, str]] = None):
+        """
+        Create the schema indexes (deferred until after the data load).
+        
+        Args:
+            conn: Target database connection
+            dropped_indexes: Indexes removed by _drop_indexes; recreated unless
+                the schema defines an index of the same name
+        """
         self.logger.info("Creating database indexes")
         
-        indexes = [
+        existing_indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+        schema_indexes = {
+            index_name: create_sql
+            for index_name, create_sql in self.schema_manager.schema_data.get('indexes', {}).items()
+            if create_sql and index_name not in existing_indexes
+            and not index_name.startswith('sqlite_autoindex')
+        }
+        indexes = list(schema_indexes.values())
+        indexes += [
+            create_sql for index_name, create_sql in (dropped_indexes or {}).items()
+            if index_name not in schema_indexes and index_name not in existing_indexes
+        ]
+        indexes += [
             'CREATE INDEX IF NOT EXISTS idx_shots_shot_name ON shots(shot_name)',
             'CREATE INDEX IF NOT EXISTS idx_shots_order ON shots(order_number)',
             'CREATE INDEX IF NOT EXISTS idx_takes_shot_id ON takes(shot_id)',
@@ -918,13 +1240,23 @@ class DatabaseMigrator:
             'CREATE INDEX IF NOT EXISTS idx_deleted_shots_old_id ON deleted_shots(old_shot_id)'
         ]
         
-        for index_sql in indexes:
-            try:
-                conn.execute(index_sql)
-            except Exception as e:
-                self.logger.warning(f"Failed to create index: {e}")
+        try:
+            conn.executescript(transaction_script(indexes))
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.logger.warning(f"Failed to create indexes in one batch ({e}), retrying one by one")
+            
+            # Keep every index that can be built; only the failing ones are lost
+            for index_sql in indexes:
+                try:
+                    conn.execute(index_sql)
+                except Exception as e:
+                    self.logger.warning(f"Failed to create index: {e}")
+            
+            if conn.in_transaction:
+                conn.commit()
         
-        conn.commit()
         self.logger.info("Database indexes created successfully")
     
     def create_video_workflow_entries(self, media_path: str, shot_mapping: Dict[str, int]) -> bool:
@@ -941,54 +1273,72 @@ class DatabaseMigrator:
         try:
             self.logger.info("Creating missing video_workflow entries for video thumbnails")
             
-            with sqlite3.connect(self.target_db_path) as conn:
-                # Get all existing video thumbnails from media folders
-                for shot_name, shot_id in shot_mapping.items():
-                    media_folder = os.path.join(media_path, str(shot_id))
+            with self._target_connection() as conn:
+                # One write transaction for all entries, taken up front so it
+                # cannot fail halfway through upgrading from a read lock
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    # Read the existing entries once instead of probing per file
+                    existing_entries = set(conn.execute(SELECT_VIDEO_WORKFLOW_TAKES_SQL))
+                    
+                    # Collect the new (shot_id, file_path) pairs, then insert
+                    # them in one batch
+                    new_entries = []
+                    created_thumbnails = []
                     
-                    if not os.path.exists(media_folder):
-                        continue
+                    # List every shot folder up front on a thread pool (the
+                    # listings spend their time in I/O with the GIL released);
+                    # all database work stays on this thread. Each folder is
+                    # read once, so the video check below is a set lookup
+                    # rather than a stat per thumbnail
+                    shots = list(shot_mapping.items())
+                    media_folders = [os.path.join(media_path, str(shot_id)) for _, shot_id in shots]
+                    max_workers = max(1, min(SCAN_WORKERS, len(media_folders)))
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        folder_listings = list(executor.map(_list_folder, media_folders))
                     
-                    # Find video thumbnails in this folder
-                    for item in os.listdir(media_folder):
-                        if item.startswith('video_') and item.endswith('.png'):
-                            video_name = item.replace('.png', '.mp4')
-                            
-                            # Create full file path for existence check
-                            full_file_path = os.path.join(media_folder, item)
-                            
-                            # Create relative path for database storage
-                            # Convert: media/1/video_01.png (relative to project root)
-                            relative_path = os.path.join('media', str(shot_id), item)
-                            # Ensure forward slashes for database storage
-                            db_file_path = relative_path.replace('\\', '/')
-                            
-                            # Check if corresponding video exists
-                            video_path = os.path.join(media_folder, video_name)
-                            if not os.path.exists(video_path):
-                                self.logger.warning(f"Video thumbnail {item} has no corresponding video in shot {shot_name}")
-                                continue
-                            
-                            # Check if video_workflow entry already exists
-                            cursor = conn.execute('''
-                                SELECT COUNT(*) FROM takes
-                                WHERE shot_id = ? AND file_path = ? AND take_type = 'video_workflow'
-                            ''', (shot_id, db_file_path))
-                            
-                            if cursor.fetchone()[0] == 0:
-                                # Create video_workflow entry
-                                take_id = generate_uuid()
-                                created_date = convert_date_to_utc(None)  # Current time
+                    # Get all existing video thumbnails from media folders
+                    for (shot_name, shot_id), folder_items in zip(shots, folder_listings):
+                        if folder_items is None:
+                            continue
+                        # Database paths are relative to the project root with
+                        # forward slashes, e.g. media/1/video_01.png
+                        db_prefix = f"media/{shot_id}/"
+                        folder_names = {os.path.normcase(name) for name in folder_items}
+                        
+                        # Find video thumbnails in this folder
+                        for item in folder_items:
+                            if item.startswith('video_') and item.endswith('.png'):
+                                video_name = item[:-4] + '.mp4'
+                                db_file_path = db_prefix + item
                                 
-                                conn.execute('''
-                                    INSERT INTO takes (
-                                        take_id, shot_id, take_type, file_path, starred, created_date
-                                    ) VALUES (?, ?, ?, ?, ?, ?)
-                                ''', (take_id, shot_id, 'video_workflow', db_file_path, 0, created_date))
+                                # Check if corresponding video exists
+                                if os.path.normcase(video_name) not in folder_names:
+                                    self.logger.warning(f"Video thumbnail {item} has no corresponding video in shot {shot_name}")
+                                    continue
                                 
-                                self.logger.info(f"Created video_workflow entry for {item} in shot {shot_name}")
+                                # Check if video_workflow entry already exists
+                                if (shot_id, db_file_path) not in existing_entries:
+                                    new_entries.append((shot_id, db_file_path))
+                                    created_thumbnails.append((item, shot_name))
+                                    existing_entries.add((shot_id, db_file_path))
+                    
+                    # Create the video_workflow entries: one timestamp for the
+                    # batch and take ids drawn from a single urandom read
+                    created_date = convert_date_to_utc(None)  # Current time
+                    take_ids = iter_uuids(batch_size=max(1, len(new_entries)))
+                    conn.executemany(INSERT_TAKE_SQL, (
+                        (take_id, shot_id, 'video_workflow', db_file_path, 0, created_date)
+                        for (shot_id, db_file_path), take_id in zip(new_entries, take_ids)
+                    ))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                
+                for item, shot_name in created_thumbnails:
+                    self.logger.info(f"Created video_workflow entry for {item} in shot {shot_name}")
                 
-                conn.commit()
                 self.logger.info("Video workflow entries creation completed")
                 return True
                 
@@ -1010,13 +1360,13 @@ class DatabaseMigrator:
             # Handle both forward and backward slashes
             normalized_path = file_path.replace('\\', '/')
             
-            # Find the 'media' directory in the path
-            # Look for both 'media/' and '/media/' patterns
-            media_index = normalized_path.lower().find('media/')
+            # Find the 'media' directory in the path (case-insensitive,
+            # without building a lowercased copy of the path)
+            match = MEDIA_DIR_PATTERN.search(normalized_path)
             
-            if media_index != -1:
+            if match:
                 # Extract path from 'media' onwards
-                relative_path = normalized_path[media_index:]  # Keep 'media/' prefix
+                relative_path = normalized_path[match.start():]  # Keep 'media/' prefix
                 return relative_path
             else:
                 # If 'media' not found, log error and return original path
@@ -1040,7 +1390,8 @@ class DatabaseMigrator:
         path = db_path or self.target_db_path
         
         try:
-            with sqlite3.connect(path) as conn:
+            target = path == self.target_db_path
+            with (self._target_connection() if target else sqlite3.connect(path)) as conn:
                 # Get table counts
                 cursor = conn.execute("""
                     SELECT name FROM sqlite_master 
@@ -1048,23 +1399,20 @@ class DatabaseMigrator:
                 """)
                 tables = [row[0] for row in cursor.fetchall()]
                 
-                table_counts = {}
-                for table in tables:
-                    cursor = conn.execute(f"SELECT COUNT(*) FROM {table}")
-                    table_counts[table] = cursor.fetchone()[0]
-                
-                # Get version info
-                cursor = conn.execute("SELECT value FROM meta WHERE key='schema_version'")
-                schema_version = cursor.fetchone()
-                
-                cursor = conn.execute("SELECT value FROM meta WHERE key='app_version'")
-                app_version = cursor.fetchone()
+                # Count every table and read the version info in one statement
+                # (table names and the two meta keys cannot collide)
+                rows = dict(conn.execute(" UNION ALL ".join(
+                    [f"SELECT '{table}', COUNT(*) FROM {table}" for table in tables]
+                    + ["SELECT key, value FROM meta WHERE key IN ('schema_version', 'app_version')"]
+                )))
+                table_counts = {table: rows[table] for table in tables}
+                versions = rows
                 
                 return {
                     'path': path,
                     'exists': True,
-                    'schema_version': schema_version[0] if schema_version else None,
-                    'app_version': app_version[0] if app_version else None,
+                    'schema_version': versions.get('schema_version'),
+                    'app_version': versions.get('app_version'),
                     'table_counts': table_counts,
                     'shot_mapping': self.shot_mapping
                 }
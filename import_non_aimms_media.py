@@ -19,6 +19,7 @@ from datetime import datetime
 
 from schema_manager import SchemaManager
 from logger import create_migration_logger
+from utils import fast_copy_file, utc_now_iso
 
 logger = create_migration_logger('option4')
 
@@ -50,6 +51,13 @@ class Option4Migrator:
         self.warnings: List[str] = []
         self.info: List[str] = []
         
+        # Connection to the new project database, opened by _create_database
+        # and kept for the take inserts; closed when migrate() returns
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        # Take rows queued by _insert_take_record until _flush_take_records
+        self._pending_takes: List[Tuple[str, int, str, str, str]] = []
+        
         # Supported file types
         self.image_extensions = {'.png'}
         self.video_extensions = {'.mp4', '.mkv'}
@@ -102,6 +110,8 @@ class Option4Migrator:
             self.errors.append(error_msg)
             self._generate_migration_log()
             return False
+        finally:
+            self._close_database()
     
     def _find_csv_file(self) -> Optional[Path]:
         """Find the CSV file in the source directory."""
@@ -325,7 +335,7 @@ class Option4Migrator:
         try:
             mapping_data = {
                 "version": "1.0",
-                "created": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "created": utc_now_iso(),
                 "mapping": {}
             }
             
@@ -354,9 +364,11 @@ class Option4Migrator:
                 self.errors.append(error_msg)
                 return False
             
-            # Create database
+            # Create database; one connection is used for the schema, meta
+            # entries, shots and takes
             db_path = self.target_path / "data" / "shots.db"
-            if not self.schema_manager.create_database_from_schema(str(db_path)):
+            self._conn = sqlite3.connect(db_path)
+            if not self.schema_manager.create_database_from_schema(str(db_path), conn=self._conn):
                 error_msg = "Failed to create database from schema"
                 logger.error(error_msg)
                 self.errors.append(error_msg)
@@ -370,7 +382,7 @@ class Option4Migrator:
                 return False
             
             # Create meta table with entries
-            with sqlite3.connect(db_path) as conn:
+            with self._conn as conn:
                 if not self.schema_manager.create_meta_table_with_entries(conn):
                     error_msg = "Failed to create meta table with entries"
                     logger.error(error_msg)
@@ -408,8 +420,9 @@ class Option4Migrator:
                 self.errors.append(error_msg)
                 return False
             
-            # Insert shots
-            shot_count = 0
+            # Prepare shot data with defaults
+            created_date = utc_now_iso()
+            shot_rows = []
             for row in rows:
                 order_number = row.get('order_number')
                 shot_name = row.get('shot_name')
@@ -417,38 +430,28 @@ class Option4Migrator:
                 if not order_number or not shot_name:
                     continue
                 
-                # Prepare shot data with defaults
-                shot_data = {
-                    'order_number': int(order_number),
-                    'shot_name': shot_name,
-                    'section': row.get('section', ''),
-                    'description': row.get('description', ''),
-                    'image_prompt': row.get('image_prompt', ''),
-                    'colour_scheme_image': row.get('colour_scheme_image', ''),
-                    'time_of_day': row.get('time_of_day', ''),
-                    'location': row.get('location', ''),
-                    'country': row.get('country', ''),
-                    'year': row.get('year', ''),
-                    'video_prompt': row.get('video_prompt', ''),
-                    'created_date': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-                }
-                
-                # Insert shot
-                cursor = conn.execute('''
-                    INSERT INTO shots (order_number, shot_name, section, description, 
-                                     image_prompt, colour_scheme_image, time_of_day, 
-                                     location, country, year, video_prompt, created_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    shot_data['order_number'], shot_data['shot_name'], shot_data['section'],
-                    shot_data['description'], shot_data['image_prompt'], shot_data['colour_scheme_image'],
-                    shot_data['time_of_day'], shot_data['location'], shot_data['country'],
-                    shot_data['year'], shot_data['video_prompt'], shot_data['created_date']
+                shot_rows.append((
+                    int(order_number), shot_name, row.get('section', ''),
+                    row.get('description', ''), row.get('image_prompt', ''), row.get('colour_scheme_image', ''),
+                    row.get('time_of_day', ''), row.get('location', ''), row.get('country', ''),
+                    row.get('year', ''), row.get('video_prompt', ''), created_date
                 ))
-                
-                shot_id = cursor.lastrowid
-                self.shot_mapping[shot_name] = shot_id
-                shot_count += 1
+            
+            # Insert all shots in one batch. AUTOINCREMENT ids only grow, so the
+            # new shots are the rows above the current maximum; reading them in
+            # id order keeps the last id for a repeated shot name, as before
+            last_shot_id = conn.execute("SELECT COALESCE(MAX(shot_id), 0) FROM shots").fetchone()[0]
+            conn.executemany('''
+                INSERT INTO shots (order_number, shot_name, section, description, 
+                                 image_prompt, colour_scheme_image, time_of_day, 
+                                 location, country, year, video_prompt, created_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', shot_rows)
+            self.shot_mapping.update(conn.execute(
+                "SELECT shot_name, shot_id FROM shots WHERE shot_id > ? ORDER BY shot_id",
+                (last_shot_id,)
+            ))
+            shot_count = len(shot_rows)
             
             conn.commit()
             
@@ -472,15 +475,23 @@ class Option4Migrator:
             video_storyboard = self.source_path / "video_storyboard"
             media_dir = self.target_path / "media"
             
-            # Process image storyboard
-            if image_storyboard.exists():
-                if not self._process_image_storyboard(image_storyboard, media_dir):
-                    return False
-            
-            # Process video storyboard
-            if video_storyboard.exists():
-                if not self._process_video_storyboard(video_storyboard, media_dir):
-                    return False
+            try:
+                # Process image storyboard
+                if image_storyboard.exists():
+                    if not self._process_image_storyboard(image_storyboard, media_dir):
+                        return False
+                
+                # Process video storyboard
+                if video_storyboard.exists():
+                    if not self._process_video_storyboard(video_storyboard, media_dir):
+                        return False
+            finally:
+                # Write the take records queued while copying, even when a
+                # storyboard failed, so the files already copied keep their takes
+                flushed = self._flush_take_records()
+            
+            if not flushed:
+                return False
             
             logger.info("Media files migrated successfully")
             return True
@@ -521,7 +532,7 @@ class Option4Migrator:
                     target_file = target_shot_dir / new_name
                     
                     # Copy file
-                    shutil.copy2(png_file, target_file)
+                    self._copy_media_file(png_file, target_file)
                     
                     # Insert take record
                     self._insert_take_record(shot_id, 'base_image', f"media/{shot_id}/{new_name}")
@@ -582,8 +593,8 @@ class Option4Migrator:
                         target_png = target_shot_dir / png_name
                         
                         # Copy files
-                        shutil.copy2(video_file, target_video)
-                        shutil.copy2(png_file, target_png)
+                        self._copy_media_file(video_file, target_video)
+                        self._copy_media_file(png_file, target_png)
                         
                         # Insert take records
                         self._insert_take_record(shot_id, 'final_video', f"media/{shot_id}/{video_name}")
@@ -608,29 +619,48 @@ class Option4Migrator:
             self.errors.append(error_msg)
             return False
     
+    def _copy_media_file(self, source_file: Path, target_file: Path):
+        """Copy a media file with its metadata (as shutil.copy2), keeping the data in the kernel where possible."""
+        fast_copy_file(source_file, target_file)
+        shutil.copystat(source_file, target_file)
+    
     def _insert_take_record(self, shot_id: int, take_type: str, file_path: str):
-        """Insert a take record into the database."""
+        """Queue a take record; _flush_take_records writes the queue to the database."""
+        # Generate UUID for take_id (matching Option 1 format)
+        take_id = generate_uuid()
+        
+        self._pending_takes.append((
+            take_id, shot_id, take_type, file_path,
+            utc_now_iso()
+        ))
+    
+    def _flush_take_records(self) -> bool:
+        """Insert all queued take records in one transaction."""
+        if not self._pending_takes:
+            return True
+        
         try:
-            db_path = self.target_path / "data" / "shots.db"
-            
-            with sqlite3.connect(db_path) as conn:
-                # Generate UUID for take_id (matching Option 1 format)
-                take_id = generate_uuid()
-                
-                conn.execute('''
+            with self._conn as conn:
+                conn.executemany('''
                     INSERT OR REPLACE INTO takes (take_id, shot_id, take_type, file_path, created_date)
                     VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    take_id, shot_id, take_type, file_path,
-                    datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-                ))
-                
-                conn.commit()
-                
+                ''', self._pending_takes)
+            
+            logger.info(f"Inserted {len(self._pending_takes)} take records")
+            self._pending_takes.clear()
+            return True
+            
         except Exception as e:
-            error_msg = f"Failed to insert take record: {e}"
+            error_msg = f"Failed to insert take records: {e}"
             logger.error(error_msg)
             self.errors.append(error_msg)
+            return False
+    
+    def _close_database(self):
+        """Close the project database connection, if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     def _generate_migration_log(self):
         """Generate migration log with all messages."""
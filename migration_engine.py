@@ -38,6 +38,8 @@ class MigrationEngine:
         self.config = config
         self.logger = create_migration_logger('engine.migration')
         self.shot_mapping: Dict[str, int] = {}
+        # Kept after the database phase so validation reuses its connection
+        self.db_migrator: Optional[DatabaseMigrator] = None
         self.migration_stats = {
             'start_time': None,
             'end_time': None,
@@ -68,17 +70,23 @@ class MigrationEngine:
             if not self._prepare_migration():
                 return False
             
-            # Phase 2: Database Migration
-            if not self._migrate_database():
-                return False
-            
-            # Phase 3: Media Migration
-            if not self._migrate_media():
-                return False
-            
-            # Phase 4: Validation
-            if not self._validate_migration():
-                return False
+            # Phases 2-4 share the database migrator's target connection;
+            # release it however they end
+            try:
+                # Phase 2: Database Migration
+                if not self._migrate_database():
+                    return False
+                
+                # Phase 3: Media Migration
+                if not self._migrate_media():
+                    return False
+                
+                # Phase 4: Validation
+                if not self._validate_migration():
+                    return False
+            finally:
+                if self.db_migrator is not None:
+                    self.db_migrator.close()
             
             # Phase 5: Reporting
             self._generate_reports()
@@ -120,10 +128,7 @@ class MigrationEngine:
         
         try:
             # Validate configuration
-            self.config.validate_source_exists()
-            self.config.validate_target_writable()
-            self.config.validate_csv_file()
-            self.config.validate_restore_file()
+            self.config.validate()
             
             # Create target directory structure
             self._create_target_directories()
@@ -177,14 +182,14 @@ class MigrationEngine:
         
         try:
             # Initialize database migrator with schema path
-            db_migrator = DatabaseMigrator(
+            self.db_migrator = DatabaseMigrator(
                 source_db_path=self.config.get_source_db_path(),
                 target_db_path=self.config.get_target_db_path(),
                 schema_path="schema/aimms-shot-db-schema.json"
             )
             
             # Execute database migration
-            migration_result = db_migrator.migrate()
+            migration_result = self.db_migrator.migrate()
             
             # Store shot mapping for media migration
             self.shot_mapping = migration_result.shot_mapping
@@ -427,12 +432,13 @@ class MigrationEngine:
             # Create missing video_workflow entries after media validation
             if validation_result.success or len([e for e in validation_result.errors if 'thumbnail' not in e]) == 0:
                 # Only create workflow entries if validation mostly passed or only thumbnail issues
-                db_migrator = DatabaseMigrator(
-                    source_db_path=self.config.get_source_db_path(),
-                    target_db_path=self.config.get_target_db_path(),
-                    schema_path="schema/aimms-shot-db-schema.json"
-                )
-                db_migrator.create_video_workflow_entries(
+                if self.db_migrator is None:
+                    self.db_migrator = DatabaseMigrator(
+                        source_db_path=self.config.get_source_db_path(),
+                        target_db_path=self.config.get_target_db_path(),
+                        schema_path="schema/aimms-shot-db-schema.json"
+                    )
+                self.db_migrator.create_video_workflow_entries(
                     media_path=self.config.get_target_media_path(),
                     shot_mapping=self.shot_mapping
                 )
@@ -10,9 +10,11 @@ import json
 import sqlite3
 import logging
 import os
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional, NamedTuple
-from datetime import datetime
+
+from utils import utc_now_iso, transaction_script
 
 class SchemaInfo(NamedTuple):
     """Schema information container."""
@@ -97,7 +99,7 @@ class SchemaManager:
             return None
         
         meta_entries = {}
-        current_time = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        current_time = utc_now_iso()
         
         for key, entry in self.meta_entries_data['meta_entries'].items():
             value = entry['value']
@@ -147,29 +149,41 @@ class SchemaManager:
             sqlite_version=metadata['sqlite_version']
         )
     
-    def create_database_from_schema(self, db_path: str) -> bool:
+    def create_database_from_schema(self, db_path: str, create_indexes: bool = True,
+                                    page_size: Optional[int] = None,
+                                    conn: Optional[sqlite3.Connection] = None) -> bool:
         """
         Create database with schema from JSON file.
         
         Args:
             db_path: Path to create the database
+            create_indexes: Create the schema indexes now; pass False when
+                bulk-loading data so the caller can build them afterwards
+            page_size: Database page size in bytes (only takes effect on a new,
+                empty database; SQLite's default is used if None)
+            conn: Open connection to db_path to create the schema on; a new
+                connection is opened if None
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
-            
-            with sqlite3.connect(db_path) as conn:
+            if conn is None:
+                # Ensure directory exists
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            
+            with (sqlite3.connect(db_path) if conn is None else nullcontext(conn)) as conn:
+                # Page size must be chosen before the first table is created
+                if page_size:
+                    conn.execute(f"PRAGMA page_size={int(page_size)}")
+                
                 # Create tables
                 table_creation_result = self._create_tables(conn)
                 if not table_creation_result:
                     return False
                 
                 # Create indexes
-                index_creation_result = self._create_indexes(conn)
-                if not index_creation_result:
+                if create_indexes and not self._create_indexes(conn):
                     return False
                 
                 conn.commit()
@@ -190,19 +204,21 @@ class SchemaManager:
             table_names = [name for name in self.schema_data['tables'].keys() 
                           if not name.endswith('_columns')]
             
-            for table_name in table_names:
-                create_sql = self.schema_data['tables'][table_name]
-                
-                # Skip sqlite_sequence as it's automatically created
-                if table_name == 'sqlite_sequence':
-                    continue
-                
-                try:
-                    conn.execute(create_sql)
-                    self.logger.info(f"Created table: {table_name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to create table {table_name}: {e}")
-                    return False
+            # sqlite_sequence is created automatically by AUTOINCREMENT
+            created_tables = [name for name in table_names if name != 'sqlite_sequence']
+            create_statements = [self.schema_data['tables'][name] for name in created_tables]
+            
+            # One executescript batch instead of a Python round trip per table
+            try:
+                conn.executescript(transaction_script(create_statements))
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                self.logger.error(f"Failed to create tables: {e}")
+                return False
+            
+            for table_name in created_tables:
+                self.logger.info(f"Created table: {table_name}")
             
             self.logger.info(f"Successfully created {len(table_names)} tables")
             return True
@@ -216,20 +232,25 @@ class SchemaManager:
         try:
             self.logger.info("Creating indexes from schema...")
             
-            index_count = 0
-            for index_name, create_sql in self.schema_data['indexes'].items():
-                # Skip auto-generated indexes (they start with sqlite_autoindex)
-                if index_name.startswith('sqlite_autoindex'):
-                    continue
-                
-                if create_sql:  # Only create if SQL is provided
-                    try:
-                        conn.execute(create_sql)
-                        self.logger.info(f"Created index: {index_name}")
-                        index_count += 1
-                    except Exception as e:
-                        self.logger.error(f"Failed to create index {index_name}: {e}")
-                        return False
+            # Skip auto-generated indexes (they start with sqlite_autoindex)
+            # and entries without SQL
+            indexes = {
+                index_name: create_sql
+                for index_name, create_sql in self.schema_data['indexes'].items()
+                if create_sql and not index_name.startswith('sqlite_autoindex')
+            }
+            
+            try:
+                conn.executescript(transaction_script(indexes.values()))
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                self.logger.error(f"Failed to create indexes: {e}")
+                return False
+            
+            for index_name in indexes:
+                self.logger.info(f"Created index: {index_name}")
+            index_count = len(indexes)
             
             self.logger.info(f"Successfully created {index_count} indexes")
             return True
@@ -341,12 +362,15 @@ class SchemaManager:
             'column_count': len(columns)
         }
     
-    def validate_database_schema(self, db_path: str) -> Dict[str, any]:
+    def validate_database_schema(self, db_path: str,
+                                 conn: Optional[sqlite3.Connection] = None) -> Dict[str, any]:
         """
         Validate that a database matches the schema.
         
         Args:
             db_path: Path to database to validate
+            conn: Open connection to db_path to validate through; a new
+                connection is opened if None
             
         Returns:
             Dictionary with validation results
@@ -361,7 +385,7 @@ class SchemaManager:
         }
         
         try:
-            with sqlite3.connect(db_path) as conn:
+            with (sqlite3.connect(db_path) if conn is None else nullcontext(conn)) as conn:
                 # Get existing tables and indexes
                 cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
                 existing_tables = {row[0] for row in cursor.fetchall()}
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+test_database_migration.py
+
+A simple test script to verify database.py migrates an old schema database
+correctly. This creates a small source database and checks the migrated
+shot ids, take paths, UTC dates and the per-row fallback for rows that fail
+to insert against the values the original migration produced.
+"""
+
+import sys
+import tempfile
+import shutil
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from database import DatabaseMigrator
+
+SCHEMA_DIR = Path(__file__).parent / "schema"
+
+
+def create_source_database(db_path):
+    """Create an old schema database with a few shots, takes and assets."""
+    conn = sqlite3.connect(db_path)
+    # assets.id_key is not a key here so a duplicate can reach the target
+    conn.executescript('''
+        CREATE TABLE shots (order_number INTEGER, shot_name TEXT, section TEXT, description TEXT,
+                            image_prompt TEXT, colour_scheme_image TEXT, time_of_day TEXT,
+                            location TEXT, country TEXT, year TEXT, video_prompt TEXT, created_date TEXT);
+        CREATE TABLE takes (shot_name TEXT, take_type TEXT, file_path TEXT, starred INTEGER, created_date TEXT);
+        CREATE TABLE assets (id_key TEXT, asset_name TEXT, asset_type TEXT, file_path TEXT,
+                             starred INTEGER, created_date TEXT);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+    ''')
+    
+    shots = [
+        (3, "UTW_00A_01C", "2025-08-29 07:51:57.978203"),
+        (1, "UTW_00A_01A", "2025-08-29T07:51:57"),
+        (2, "UTW_00A_01B", "2025-08-29"),
+    ]
+    for order_number, shot_name, created_date in shots:
+        conn.execute(
+            "INSERT INTO shots VALUES (?, ?, 'intro', '', '', '', 'day', '', '', '', '', ?)",
+            (order_number, shot_name, created_date)
+        )
+    
+    takes = [
+        ("UTW_00A_01A", "base_image", "C:\\project\\media\\UTW_00A_01A\\base_01.png", 1, "2025-08-29 07:51:57"),
+        ("UTW_00A_01B", "video", "/home/user/project/media/UTW_00A_01B/take_01.mp4", 0, "2025-08-29T10:00:00Z"),
+        ("UTW_00A_01B", "mask_video", "media/UTW_00A_01B/mask_01.mp4", 0, "2025-08-29"),
+        ("UTW_00A_01C", "base_image", "media/UTW_00A_01C/base_01.png", 0, "2025-02-28 23:59:59.5"),
+        ("UNKNOWN", "base_image", "media/UNKNOWN/base_01.png", 0, "2025-08-29"),
+    ]
+    conn.executemany("INSERT INTO takes VALUES (?, ?, ?, ?, ?)", takes)
+    
+    assets = [
+        ("asset_1", "hero", "character", "D:\\old\\media\\assets\\hero.png", 1, "2025-08-29 07:51:57"),
+        ("asset_2", "forest", "location", "/old/media/assets/forest.png", 0, "2025-08-29"),
+        ("asset_2", "forest copy", "location", "/old/media/assets/forest_copy.png", 0, "2025-08-29"),
+    ]
+    conn.executemany("INSERT INTO assets VALUES (?, ?, ?, ?, ?, ?)", assets)
+    
+    conn.execute("INSERT INTO meta VALUES ('created_at', '2024-01-02 03:04:05')")
+    conn.commit()
+    conn.close()
+
+
+def run_migration(test_dir):
+    """Migrate a fresh source database and return the result and target connection."""
+    source_db = test_dir / "source.db"
+    target_db = test_dir / "target.db"
+    create_source_database(source_db)
+    
+    migrator = DatabaseMigrator(
+        str(source_db), str(target_db),
+        schema_path=str(SCHEMA_DIR / "aimms-shot-db-schema.json"),
+        meta_entries_path=str(SCHEMA_DIR / "aimms-meta-entries.json")
+    )
+    result = migrator.migrate()
+    migrator.close()
+    return result, sqlite3.connect(target_db)
+
+
+def _migrate():
+    """Run the migration in a temporary folder and read back the migrated rows."""
+    test_dir = Path(tempfile.mkdtemp(prefix="migration_test_"))
+    try:
+        result, conn = run_migration(test_dir)
+        try:
+            return result, {
+                "shots": conn.execute(
+                    "SELECT shot_id, order_number, shot_name, created_date FROM shots ORDER BY shot_id"
+                ).fetchall(),
+                "takes": conn.execute(
+                    "SELECT shot_id, take_type, file_path, starred, created_date FROM takes ORDER BY shot_id, file_path"
+                ).fetchall(),
+                "assets": conn.execute(
+                    "SELECT id_key, asset_name, file_path, created_date FROM assets ORDER BY id_key"
+                ).fetchall(),
+                "created_at": conn.execute("SELECT value FROM meta WHERE key = 'created_at'").fetchone(),
+            }
+        finally:
+            conn.close()
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_shot_ids():
+    """Shots are numbered from 1 in order_number order."""
+    result, tables = _migrate()
+    assert result.shot_mapping == {"UTW_00A_01A": 1, "UTW_00A_01B": 2, "UTW_00A_01C": 3}
+    assert [row[:3] for row in tables["shots"]] == [
+        (1, 1, "UTW_00A_01A"),
+        (2, 2, "UTW_00A_01B"),
+        (3, 3, "UTW_00A_01C"),
+    ]
+
+
+def test_take_paths():
+    """Take paths are made relative to media/ and use the new shot id."""
+    result, tables = _migrate()
+    assert [row[:4] for row in tables["takes"]] == [
+        (1, "base_image", "media/1/base_01.png", 1),
+        (2, "video", "media/2/take_01.mp4", 0),
+        (3, "base_image", "media/3/base_01.png", 0),
+    ]
+    assert "Shot name UNKNOWN not found in mapping" in result.errors
+
+
+def test_utc_dates():
+    """Source dates are converted to UTC ISO 8601."""
+    result, tables = _migrate()
+    assert [row[3] for row in tables["shots"]] == [
+        "2025-08-29T07:51:57Z",
+        "2025-08-29T00:00:00Z",
+        "2025-08-29T07:51:57Z",
+    ]
+    assert [row[4] for row in tables["takes"]] == [
+        "2025-08-29T07:51:57Z",
+        "2025-08-29T10:00:00Z",
+        "2025-02-28T23:59:59Z",
+    ]
+    assert tables["created_at"] == ("2024-01-02T03:04:05Z",)
+
+
+def test_row_error_fallback():
+    """A row that fails to insert is reported and the other rows are kept."""
+    result, tables = _migrate()
+    assert tables["assets"] == [
+        ("asset_1", "hero", "media/assets/hero.png", "2025-08-29T07:51:57Z"),
+        ("asset_2", "forest", "media/assets/forest.png", "2025-08-29T00:00:00Z"),
+    ]
+    assert result.errors == [
+        "Shot name UNKNOWN not found in mapping",
+        "Failed to migrate asset asset_2: UNIQUE constraint failed: assets.id_key",
+    ]
+    assert not result.success
+
+
+def main():
+    """Main test function."""
+    print("Testing database.py migration")
+    print("=" * 50)
+    
+    failed = 0
+    for test in (test_shot_ids, test_take_paths, test_utc_dates, test_row_error_fallback):
+        try:
+            test()
+            print(f"PASS: {test.__name__}")
+        except AssertionError:
+            failed += 1
+            print(f"FAIL: {test.__name__}")
+            import traceback
+            traceback.print_exc()
+    
+    print("=" * 50)
+    print(f"{failed} test(s) failed" if failed else "All tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
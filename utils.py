@@ -6,13 +6,22 @@ Contains helper functions used across the migration tool.
 
 import uuid
 import os
+import errno
 import shutil
-from datetime import datetime
-from typing import Optional, Dict, List, Any
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Any, Iterable, Iterator
 import logging
 
 logger = logging.getLogger('aimms_migration.utils')
 
+# Buffer size for the userspace copy fallback in fast_copy_file
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Errors meaning an in-kernel copy is unsupported here and the next method should be tried
+_KERNEL_COPY_FALLBACK_ERRNOS = {
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSOCK, errno.EBADF
+}
+
 def generate_uuid() -> str:
     """
     Generate a UUID string for take_id.
@@ -22,6 +31,66 @@ def generate_uuid() -> str:
     """
     return str(uuid.uuid4())
 
+def utc_now_iso() -> str:
+    """
+    Get the current time in UTC ISO 8601 format.
+    
+    Returns:
+        Date string with 'Z' suffix, e.g. 2025-08-29T07:51:57Z
+    """
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def iter_uuids(batch_size: int = 1024) -> Iterator[str]:
+    """
+    Yield UUID strings like generate_uuid, without a system call per UUID.
+    
+    Random bytes are read from os.urandom in batches of ``batch_size``
+    UUIDs. The version 4 and RFC 4122 variant bits are set on the whole
+    batch at once and the strings are cut from its hex form, which gives
+    the same result as str(uuid.UUID(bytes=..., version=4)) without
+    building a UUID object per value.
+    
+    Args:
+        batch_size: Number of UUIDs drawn per os.urandom call
+        
+    Yields:
+        UUID strings
+    """
+    while True:
+        buffer = bytearray(os.urandom(16 * batch_size))
+        buffer[6::16] = bytes((byte & 0x0F) | 0x40 for byte in buffer[6::16])
+        buffer[8::16] = bytes((byte & 0x3F) | 0x80 for byte in buffer[8::16])
+        hex_digits = buffer.hex()
+        for offset in range(0, len(hex_digits), 32):
+            yield (f'{hex_digits[offset:offset + 8]}-{hex_digits[offset + 8:offset + 12]}-'
+                   f'{hex_digits[offset + 12:offset + 16]}-{hex_digits[offset + 16:offset + 20]}-'
+                   f'{hex_digits[offset + 20:offset + 32]}')
+
+def transaction_script(statements: Iterable[str]) -> str:
+    """
+    Join SQL statements into one script wrapped in BEGIN/COMMIT.
+    
+    executescript() commits any pending transaction and then runs in
+    autocommit mode, so the explicit BEGIN/COMMIT keeps the batch atomic.
+    
+    Args:
+        statements: SQL statements without trailing semicolons
+        
+    Returns:
+        Script suitable for sqlite3.Connection.executescript()
+    """
+    body = ";\n".join(statement.strip().rstrip(';') for statement in statements)
+    return f"BEGIN;\n{body};\nCOMMIT;" if body else ""
+
+# Date formats found in source databases, most common first
+SOURCE_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S.%f',      # 2025-08-29 07:51:57.978203
+    '%Y-%m-%dT%H:%M:%S.%f',      # 2025-08-29T07:51:57.978203
+    '%Y-%m-%d %H:%M:%S',         # 2025-08-29 07:51:57
+    '%Y-%m-%dT%H:%M:%S',         # 2025-08-29T07:51:57
+    '%Y-%m-%d'                   # 2025-08-29
+)
+
 def convert_date_to_utc(date_str: Optional[str]) -> str:
     """
     Convert date string to UTC ISO 8601 format.
@@ -33,21 +102,15 @@ def convert_date_to_utc(date_str: Optional[str]) -> str:
         Date string in UTC ISO 8601 format with 'Z' suffix
     """
     if not date_str:
-        return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        return utc_now_iso()
     
     try:
         # Already in ISO format
         if date_str.endswith('Z'):
             return date_str
         
-        # Try formats with microseconds
-        for fmt in [
-            '%Y-%m-%d %H:%M:%S.%f',      # 2025-08-29 07:51:57.978203
-            '%Y-%m-%dT%H:%M:%S.%f',      # 2025-08-29T07:51:57.978203
-            '%Y-%m-%d %H:%M:%S',         # 2025-08-29 07:51:57
-            '%Y-%m-%dT%H:%M:%S',         # 2025-08-29T07:51:57
-            '%Y-%m-%d'                   # 2025-08-29
-        ]:
+        # Try formats with microseconds first
+        for fmt in SOURCE_DATE_FORMATS:
             try:
                 dt = datetime.strptime(date_str, fmt)
                 return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -56,11 +119,11 @@ def convert_date_to_utc(date_str: Optional[str]) -> str:
         
         # If all else fails, use current UTC time
         logger.warning(f"Could not parse date: {date_str}, using current time")
-        return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        return utc_now_iso()
         
     except Exception as e:
         logger.warning(f"Date conversion failed for {date_str}: {e}")
-        return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        return utc_now_iso()
 
 def update_file_path(file_path: str, shot_id: int, old_shot_name: Optional[str] = None) -> str:
     """
@@ -90,6 +153,53 @@ def update_file_path(file_path: str, shot_id: int, old_shot_name: Optional[str]
     
     return file_path
 
+def _kernel_copy_functions():
+    """Return the in-kernel copy primitives available on this platform, fastest first."""
+    functions = []
+    if hasattr(os, 'copy_file_range'):
+        functions.append(lambda in_fd, out_fd, count: os.copy_file_range(in_fd, out_fd, count))
+    if hasattr(os, 'sendfile'):
+        functions.append(lambda in_fd, out_fd, count: os.sendfile(out_fd, in_fd, None, count))
+    return functions
+
+_KERNEL_COPY_FUNCTIONS = _kernel_copy_functions()
+
+def fast_copy_file(src: str, dst: str):
+    """
+    Copy file contents from source to target.
+    
+    Uses copy_file_range (reflink-aware on CoW filesystems) or sendfile so the
+    data stays in the kernel, falling back to a buffered userspace copy where
+    neither is supported. Metadata is not copied; follow with shutil.copystat
+    for copy2 behaviour.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        remaining = os.fstat(in_fd).st_size
+        
+        for kernel_copy in _KERNEL_COPY_FUNCTIONS:
+            try:
+                while remaining > 0:
+                    copied = kernel_copy(in_fd, out_fd, remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError as e:
+                if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                    raise
+            if remaining == 0:
+                return
+            # Both file offsets have advanced past any partial copy (cut short
+            # by an error or an early zero return), so the next method carries
+            # on from where this one stopped
+        
+        shutil.copyfileobj(fsrc, fdst, _COPY_BUFFER_SIZE)
+
 def safe_copy_file(src: str, dst: str, overwrite: bool = True) -> bool:
     """
     Safely copy a file with error handling.